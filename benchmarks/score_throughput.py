@@ -0,0 +1,83 @@
+"""Compare per-item scoring throughput of the compiled profile and the legacy scorer.
+
+Usage:
+    python benchmarks/score_throughput.py [--items N] [--repeat R]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.app.config import ScoringProfile  # noqa: E402
+from src.app.release import ReleaseClassifier  # noqa: E402
+from src.app.scoring import CompiledProfile  # noqa: E402
+from src.app.torznab import TorrentResult  # noqa: E402
+
+LEGACY_SOURCE_BONUS = {"web-dl": 10, "bluray": 8, "webrip": 6}
+
+
+def legacy_score(torrent: TorrentResult) -> float:
+    """The hardcoded scorer used before scoring profiles"""
+    score = 0.0
+    score += min(torrent.seeders / 10.0, 10.0)
+    score += LEGACY_SOURCE_BONUS.get(torrent.release.source, 0)
+    size_diff = abs(torrent.size_gb - 4.0)
+    score += max(0, 5 - size_diff)
+    if torrent.download_volume_factor == 0.0:
+        score += 15
+    return score
+
+
+def build_torrents(count: int) -> list[TorrentResult]:
+    titles = [
+        "Movie.2023.1080p.WEB-DL.x264-GRP", "Movie.2023.1080p.BluRay.x264-GRP",
+        "Movie.2023.1080p.WEBRip.x265-GRP", "Movie.2023.720p.HDTV.x264-GRP",
+    ]
+    classifier = ReleaseClassifier(re.compile("1080p"), re.compile("CAM"))
+    torrents = []
+    for i in range(count):
+        torrent = TorrentResult(
+            title=titles[i % len(titles)],
+            size=int((1.5 + (i % 11) * 0.5) * 1024 ** 3),
+            seeders=(i * 7) % 160,
+            peers=(i * 3) % 40,
+            grabs=(i * 11) % 900,
+            download_volume_factor=0.0 if i % 13 == 0 else 1.0,
+            upload_volume_factor=2.0 if i % 17 == 0 else 1.0,
+        )
+        classifier.classify_torrent(torrent)
+        torrents.append(torrent)
+    return torrents
+
+
+def run(name: str, scorer, torrents: list[TorrentResult], repeat: int) -> None:
+    seconds = min(timeit.repeat(lambda: [scorer(t) for t in torrents], number=1, repeat=repeat))
+    print(f"{name:<24} {len(torrents) / seconds / 1e6:6.2f} M items/s  ({seconds * 1e3:.2f} ms)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    torrents = build_torrents(args.items)
+    default = CompiledProfile(ScoringProfile())
+    extended = CompiledProfile(ScoringProfile(
+        peers_weight=0.1, peers_cap=3.0, grabs_weight=0.01, grabs_cap=2.0, upload_bonus=2.0
+    ))
+
+    drift = max(abs(legacy_score(t) - default.score(t)) for t in torrents)
+    print(f"default profile vs legacy scorer, max score difference: {drift:.2e}\n")
+
+    run("legacy _calculate_score", legacy_score, torrents, args.repeat)
+    run("compiled default", default.score, torrents, args.repeat)
+    run("compiled extended", extended.score, torrents, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
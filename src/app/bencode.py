@@ -0,0 +1,156 @@
+"""Validating bencode scanner for .torrent files.
+
+The scanner walks the encoded structure in place over a ``memoryview``:
+values are checked and skipped rather than decoded, so validating a torrent
+allocates almost nothing. The byte span of the ``info`` dictionary is
+recorded while scanning, which gives the v1 infohash directly as the SHA-1
+of that span without re-encoding it.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+# Nesting deeper than this is not produced by any real torrent client
+MAX_DEPTH = 64
+
+_DIGITS = frozenset(b"0123456789")
+
+
+class BencodeError(ValueError):
+    """Raised when data is not valid bencode or not a torrent"""
+
+
+class TorrentMeta(NamedTuple):
+    """Identity of a parsed .torrent file"""
+
+    infohash: str
+    name: str
+    info_span: tuple[int, int]
+    announce: str | None
+
+
+class _Scanner:
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.view = memoryview(data).cast("B") if isinstance(data, memoryview) else memoryview(data)
+        self.size = len(self.view)
+
+    def _byte(self, pos: int) -> int:
+        if pos >= self.size:
+            raise BencodeError("Unexpected end of data")
+        return self.view[pos]
+
+    def _number(self, pos: int, terminator: int, signed: bool) -> tuple[int, int]:
+        """Parse ASCII digits up to ``terminator``, returning (value, end)"""
+        start = pos
+        negative = signed and self._byte(pos) == 0x2D  # '-'
+        if negative:
+            pos += 1
+
+        digits_start = pos
+        value = 0
+        while (byte := self._byte(pos)) != terminator:
+            if byte not in _DIGITS:
+                raise BencodeError(f"Invalid digit at offset {pos}")
+            value = value * 10 + byte - 0x30
+            pos += 1
+
+        length = pos - digits_start
+        if length == 0:
+            raise BencodeError(f"Empty number at offset {start}")
+        if length > 1 and self.view[digits_start] == 0x30:
+            raise BencodeError(f"Leading zero at offset {start}")
+        if negative and value == 0:
+            raise BencodeError(f"Negative zero at offset {start}")
+
+        return (-value if negative else value), pos + 1
+
+    def string(self, pos: int) -> tuple[memoryview, int]:
+        """Return a view of the byte string at ``pos`` and the offset after it"""
+        length, start = self._number(pos, 0x3A, signed=False)  # ':'
+        end = start + length
+        if end > self.size:
+            raise BencodeError(f"String at offset {pos} runs past end of data")
+        return self.view[start:end], end
+
+    def skip(self, pos: int, depth: int = 0) -> int:
+        """Validate the value at ``pos`` and return the offset after it"""
+        if depth > MAX_DEPTH:
+            raise BencodeError("Nesting too deep")
+
+        byte = self._byte(pos)
+        if byte == 0x69:  # 'i'
+            return self._number(pos + 1, 0x65, signed=True)[1]
+        if byte == 0x6C:  # 'l'
+            pos += 1
+            while self._byte(pos) != 0x65:
+                pos = self.skip(pos, depth + 1)
+            return pos + 1
+        if byte == 0x64:  # 'd'
+            pos += 1
+            while self._byte(pos) != 0x65:
+                pos = self.string(pos)[1]
+                pos = self.skip(pos, depth + 1)
+            return pos + 1
+        if byte in _DIGITS:
+            return self.string(pos)[1]
+
+        raise BencodeError(f"Unexpected byte {byte:#04x} at offset {pos}")
+
+    def dict_items(self, pos: int):
+        """Yield (key, value_start, value_end) for the dictionary at ``pos``"""
+        if self._byte(pos) != 0x64:
+            raise BencodeError(f"Expected a dictionary at offset {pos}")
+
+        pos += 1
+        while self._byte(pos) != 0x65:
+            key, value_start = self.string(pos)
+            pos = self.skip(value_start, 1)
+            yield key, value_start, pos
+
+
+def parse_torrent(data: bytes | bytearray | memoryview) -> TorrentMeta:
+    """Validate a .torrent file and return its infohash, name and info span
+
+    Raises BencodeError if the data is not a single bencoded dictionary with
+    an ``info`` dictionary carrying ``name`` and ``piece length``.
+    """
+    scanner = _Scanner(data)
+
+    info_span = None
+    announce = None
+    end = 1
+
+    for key, value_start, end in scanner.dict_items(0):
+        if key == b"info":
+            info_span = (value_start, end)
+        elif key == b"announce" and scanner.view[value_start] in _DIGITS:
+            announce = bytes(scanner.string(value_start)[0]).decode("utf-8", "replace")
+
+    end += 1  # closing 'e' of the top-level dictionary
+    if end != scanner.size:
+        raise BencodeError("Trailing data after torrent dictionary")
+    if info_span is None:
+        raise BencodeError("Missing info dictionary")
+
+    name = None
+    has_piece_length = False
+    for key, value_start, _ in scanner.dict_items(info_span[0]):
+        if key == b"name" and scanner.view[value_start] in _DIGITS:
+            name = bytes(scanner.string(value_start)[0]).decode("utf-8", "replace")
+        elif key == b"piece length" and scanner.view[value_start] == 0x69:
+            has_piece_length = True
+
+    if name is None or not has_piece_length:
+        raise BencodeError("Info dictionary lacks name or piece length")
+
+    infohash = hashlib.sha1(scanner.view[info_span[0]:info_span[1]], usedforsecurity=False).hexdigest()
+    return TorrentMeta(infohash=infohash, name=name, info_span=info_span, announce=announce)
+
+
+def is_torrent(data: bytes | bytearray | memoryview) -> bool:
+    """Check whether data is a structurally valid .torrent file"""
+    try:
+        parse_torrent(data)
+    except BencodeError:
+        return False
+    return True
@@ -1,67 +1,232 @@
+import asyncio
+import contextlib
 import hashlib
 import logging
 import os
+import tempfile
+import time
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+from .bencode import BencodeError, is_torrent, parse_torrent
 from .config import settings
+from .http_client import http_clients
+from .torznab import TorrentResult
 
 logger = logging.getLogger(__name__)
 
 
+class WatchDirIndex:
+    """Infohashes of the torrents in the watch directory.
+
+    Covers files waiting to be picked up (``*.torrent``) and files AutoAdd
+    has already added (``*.torrent.added``). ``refresh`` only parses files
+    it has not seen before, and runs at startup and before each grab so
+    files other tools add, delete or rename are picked up; our own saves
+    are recorded with ``add`` as they happen.
+    """
+
+    PATTERNS = ("*.torrent", "*.torrent.added")
+
+    def __init__(self, watch_dir: Path):
+        self.watch_dir = watch_dir
+        self._by_file: dict[str, str] = {}
+        self._by_hash: dict[str, set[str]] = {}
+        # Unparseable files by modification time, retried only once they change
+        self._unreadable: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def get(self, infohash: str) -> str | None:
+        """Return a file holding the torrent with this infohash, if any"""
+        files = self._by_hash.get(infohash)
+        return next(iter(files)) if files else None
+
+    def add(self, infohash: str, filename: str) -> None:
+        self._discard(filename)
+        self._by_file[filename] = infohash
+        self._by_hash.setdefault(infohash, set()).add(filename)
+
+    def refresh(self) -> int:
+        """Sync with the directory listing, returning how many files were parsed
+
+        Blocking: run it in a worker thread from async code.
+        """
+        if not self.watch_dir.exists():
+            return 0
+
+        present = {path.name: path for pattern in self.PATTERNS for path in self.watch_dir.glob(pattern)}
+
+        for filename in set(self._by_file) - set(present):
+            self._discard(filename)
+        for filename in set(self._unreadable) - set(present):
+            del self._unreadable[filename]
+
+        parsed = 0
+        for filename, path in present.items():
+            if filename in self._by_file:
+                continue
+            try:
+                mtime = path.stat().st_mtime
+                if self._unreadable.get(filename) == mtime:
+                    continue
+                meta = parse_torrent(path.read_bytes())
+            except (OSError, BencodeError) as e:
+                logger.warning(f"Skipping unreadable torrent in watch dir '{filename}': {e}")
+                if not isinstance(e, OSError):
+                    self._unreadable[filename] = mtime
+                continue
+            self._unreadable.pop(filename, None)
+            self.add(meta.infohash, filename)
+            parsed += 1
+
+        return parsed
+
+    def _discard(self, filename: str) -> None:
+        infohash = self._by_file.pop(filename, None)
+        if infohash is None:
+            return
+        files = self._by_hash[infohash]
+        files.discard(filename)
+        if not files:
+            del self._by_hash[infohash]
+
+
 class BlackholeClient:
     def __init__(self):
         self.watch_dir = Path(settings.autoadd_watch_dir)
+        self.index = WatchDirIndex(self.watch_dir)
+        self.grab_max_attempts = max(1, settings.grab_max_attempts)
+        self.grab_time_budget = settings.grab_time_budget
+        self.grab_attempt_timeout = settings.grab_attempt_timeout
+        self.race_count = settings.grab_race_count
+        self.max_torrent_bytes = int(settings.max_torrent_file_mb * 1024 * 1024)
+
+    async def startup(self) -> None:
+        """Index the torrents already in the watch directory"""
+        parsed = await asyncio.to_thread(self.index.refresh)
+        logger.info(f"Indexed {parsed} torrents in watch directory {self.watch_dir}")
+
+    async def download_torrent(self, torrent: TorrentResult) -> dict[str, Any]:
+        """Download torrent file and save to blackhole directory
+
+        A torrent already in the watch directory is not downloaded again when
+        the indexer reported its infohash, and is never written twice.
+        """
+        duplicate = self._find_duplicate(torrent)
+        if duplicate is not None:
+            return duplicate
+
+        content = await self._fetch_torrent(torrent)
+        return self._find_duplicate(torrent) or await self._save_torrent(torrent, content)
+
+    def _find_duplicate(self, torrent: TorrentResult) -> dict[str, Any] | None:
+        """Describe the existing file for a torrent that is already in the watch directory"""
+        existing = self.index.get(torrent.infohash) if torrent.infohash else None
+        if existing is None:
+            return None
+
+        logger.info(f"Torrent already in watch directory: {existing}")
+
+        return {
+            "filename": existing,
+            "path": str(self.watch_dir / existing),
+            "size": 0,
+            "torrent_data": torrent.to_dict(),
+            "duplicate": True
+        }
+
+    async def _fetch_torrent(self, torrent: TorrentResult) -> bytes:
+        """Download a torrent file and check that it is valid, without saving it
 
-    async def download_torrent(self, torrent_data: dict[str, Any]) -> dict[str, Any]:
-        """Download torrent file and save to blackhole directory"""
+        The body is streamed and the download is aborted as soon as it grows
+        past MAX_TORRENT_FILE_MB, so memory per download stays bounded.
+        """
 
-        download_url = torrent_data.get("download_url")
-        title = torrent_data.get("title", "unknown")
+        download_url = torrent.download_url
 
         if not download_url:
             raise ValueError("No download URL found in torrent data")
 
-        # Create watch directory if it doesn't exist
-        self.watch_dir.mkdir(parents=True, exist_ok=True)
+        client = http_clients.get("downloads")
+        content = bytearray()
+        try:
+            # Download the torrent file
+            async with client.stream("GET", download_url) as response:
+                response.raise_for_status()
+
+                declared = response.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > self.max_torrent_bytes:
+                    raise ValueError(f"Torrent file too large ({int(declared)} bytes)")
+
+                async for chunk in response.aiter_bytes():
+                    content += chunk
+                    if len(content) > self.max_torrent_bytes:
+                        raise ValueError(f"Torrent file exceeds {self.max_torrent_bytes} bytes")
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error downloading torrent: {e}")
+            raise
+
+        # Verify it's actually a torrent file, scanning the buffer in place
+        try:
+            meta = parse_torrent(content)
+        except BencodeError as e:
+            raise ValueError(f"Downloaded file is not a valid torrent: {e}") from e
+
+        # The file's own infohash is authoritative over what the indexer reported
+        torrent.infohash = meta.infohash
+
+        return bytes(content)
+
+    async def _save_torrent(self, torrent: TorrentResult, content: bytes) -> dict[str, Any]:
+        """Write a downloaded torrent file to the blackhole directory"""
 
         # Generate safe filename
-        filename = self._generate_filename(title)
+        filename = self._generate_filename(torrent.title or "unknown")
         file_path = self.watch_dir / filename
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Download the torrent file
-                response = await client.get(download_url)
-                response.raise_for_status()
+        try:
+            # Disk I/O runs in a worker thread so the event loop never blocks on it
+            await asyncio.to_thread(self._write_atomic, file_path, content)
+            self.index.add(torrent.infohash, filename)
 
-                # Verify it's actually a torrent file
-                content = response.content
-                if not self._is_valid_torrent(content):
-                    raise ValueError("Downloaded file is not a valid torrent")
+        except OSError as e:
+            logger.error(f"Error writing torrent file: {e}")
+            raise
 
-                # Write to blackhole directory
-                with open(file_path, "wb") as f:
-                    f.write(content)
+        logger.info(f"Downloaded torrent: {filename}")
 
-                logger.info(f"Downloaded torrent: {filename}")
+        return {
+            "filename": filename,
+            "path": str(file_path),
+            "size": len(content),
+            "torrent_data": torrent.to_dict()
+        }
 
-                return {
-                    "filename": filename,
-                    "path": str(file_path),
-                    "size": len(content),
-                    "torrent_data": torrent_data
-                }
+    def _write_atomic(self, file_path: Path, content: bytes) -> None:
+        """Write to a hidden temp file, then rename it into place
 
-            except httpx.HTTPError as e:
-                logger.error(f"Error downloading torrent: {e}")
-                raise
+        The watcher only ever sees a complete .torrent file: the temp name
+        does not match its pattern and the rename is atomic on one filesystem.
+        """
+        # Create watch directory if it doesn't exist
+        self.watch_dir.mkdir(parents=True, exist_ok=True)
 
-            except OSError as e:
-                logger.error(f"Error writing torrent file: {e}")
-                raise
+        fd, tmp_name = tempfile.mkstemp(dir=self.watch_dir, prefix=".", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+            raise
 
     def _generate_filename(self, title: str) -> str:
         """Generate a safe filename for the torrent file"""
@@ -80,18 +245,8 @@ class BlackholeClient:
         return filename
 
     def _is_valid_torrent(self, content: bytes) -> bool:
-        """Basic validation that content is a torrent file"""
-        try:
-            # Torrent files start with 'd' (dictionary) in bencode format
-            if not content.startswith(b'd'):
-                return False
-
-            # Look for common torrent file markers
-            content_str = content.decode('latin-1', errors='ignore')
-            return 'announce' in content_str and 'info' in content_str
-
-        except Exception:
-            return False
+        """Validate that content is a bencoded torrent with an info dictionary"""
+        return is_torrent(content)
 
     def get_watch_dir_status(self) -> dict[str, Any]:
         """Get status information about the watch directory"""
@@ -129,26 +284,140 @@ class BlackholeClient:
             }
 
     async def grab_via_blackhole(self, title: str, year: int | None = None) -> dict[str, Any]:
-        """High-level method: search via Jackett and download to blackhole"""
+        """High-level method: search via Jackett and download to blackhole
+
+        The ranked candidates from one search are kept for the whole grab. By
+        default they are tried in turn: if a download fails or is not a valid
+        torrent, the next-best candidate is tried, up to GRAB_MAX_ATTEMPTS
+        within GRAB_TIME_BUDGET seconds. With GRAB_RACE_COUNT above 1 the top
+        candidates are downloaded at once and the first valid one wins.
+        """
         from .jackett import jackett_client
 
-        # Search for the best torrent
-        best_torrent = await jackett_client.get_best_torrent(title, year)
+        # Search once for the ranked candidates, meanwhile picking up watch dir
+        # changes made by other tools since the last grab
+        candidates, _ = await asyncio.gather(
+            jackett_client.get_ranked_torrents(title, year),
+            asyncio.to_thread(self.index.refresh)
+        )
 
-        if not best_torrent:
+        if not candidates:
             raise ValueError(f"No suitable torrents found for '{title}'")
 
-        # Download the torrent file
-        download_result = await self.download_torrent(best_torrent)
+        if self.race_count > 1:
+            torrent, download_result, attempts = await self._race_downloads(
+                candidates[:self.race_count], title
+            )
+        else:
+            torrent, download_result, attempts = await self._download_in_turn(candidates, title)
+
+        logger.info(f"Selected torrent: {torrent.title} (Score: {torrent.score:.1f})")
 
         return {
             "method": "blackhole",
             "title": title,
             "year": year,
-            "torrent": best_torrent,
+            "torrent": torrent.to_dict(),
             "download": download_result,
-            "watch_dir": str(self.watch_dir)
+            "watch_dir": str(self.watch_dir),
+            "attempts": attempts
+        }
+
+    async def _download_in_turn(
+        self, candidates: list[TorrentResult], title: str
+    ) -> tuple[TorrentResult, dict[str, Any], int]:
+        """Try candidates best first until one downloads, within the attempt and time limits
+
+        Each download is also cut off after GRAB_ATTEMPT_TIMEOUT seconds, so a
+        tracker that hangs costs only its own share of the budget and the
+        next candidate is still tried. The file is saved outside that limit.
+        """
+        deadline = time.monotonic() + self.grab_time_budget
+        attempts = 0
+        last_error: Exception | None = None
+
+        for torrent in candidates[:self.grab_max_attempts]:
+            remaining = deadline - time.monotonic()
+            if attempts and remaining <= 0:
+                logger.warning(f"Grab time budget spent after {attempts} attempts for '{title}'")
+                break
+
+            attempts += 1
+            duplicate = self._find_duplicate(torrent)
+            if duplicate is not None:
+                return torrent, duplicate, attempts
+
+            limit = min(self.grab_attempt_timeout, remaining) if attempts > 1 else self.grab_attempt_timeout
+            try:
+                async with asyncio.timeout(limit):
+                    # Download the torrent file
+                    content = await self._fetch_torrent(torrent)
+            except TimeoutError:
+                last_error = TimeoutError(f"Download did not finish within {limit:.0f}s")
+            except (httpx.HTTPError, ValueError) as e:
+                last_error = e
+            else:
+                download_result = self._find_duplicate(torrent) or await self._save_torrent(torrent, content)
+                return torrent, download_result, attempts
+
+            logger.warning(f"Candidate {attempts} failed for '{title}' ({torrent.title}): {last_error}")
+
+        raise last_error
+
+    async def _race_downloads(
+        self, candidates: list[TorrentResult], title: str
+    ) -> tuple[TorrentResult, dict[str, Any], int]:
+        """Download several candidates at once and save the first valid one
+
+        Whichever tracker answers first with a valid file wins, with rank
+        deciding between downloads that finish together. The remaining
+        downloads are cancelled unsaved.
+        """
+        for torrent in candidates:
+            duplicate = self._find_duplicate(torrent)
+            if duplicate is not None:
+                return torrent, duplicate, 0
+
+        tasks = {
+            asyncio.create_task(self._fetch_torrent(torrent)): torrent
+            for torrent in candidates
         }
+        pending = set(tasks)
+        winner: tuple[TorrentResult, bytes] | None = None
+        last_error: Exception = TimeoutError(
+            f"No candidate downloaded within {self.grab_time_budget:.0f}s"
+        )
+
+        # The budget covers the downloads only; the winner is saved afterwards
+        # so a write in progress is never abandoned half-recorded
+        try:
+            async with asyncio.timeout(self.grab_time_budget):
+                while pending and winner is None:
+                    finished, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in [t for t in tasks if t in finished]:
+                        torrent = tasks[task]
+                        try:
+                            winner = torrent, task.result()
+                            break
+                        except (httpx.HTTPError, ValueError) as e:
+                            logger.warning(f"Raced candidate failed for '{title}' ({torrent.title}): {e}")
+                            last_error = e
+        except TimeoutError:
+            logger.warning(f"Grab time budget spent racing {len(tasks)} candidates for '{title}'")
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if winner is None:
+            raise last_error
+
+        torrent, content = winner
+        download_result = self._find_duplicate(torrent) or await self._save_torrent(torrent, content)
+        return torrent, download_result, len(tasks)
 
 
 # Global client instance
@@ -1,8 +1,47 @@
 import secrets
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Matched as whole release tokens rather than substrings (see ReleaseClassifier)
+DEFAULT_EXCLUDE_REGEX = r"CAM|TS|TC|WORKPRINT"
+
+
+class ScoringProfile(BaseModel):
+    """Weights used to rank torrent candidates
+
+    Every term is bounded so the highest reachable score is known, which lets
+    a search stop reading once a perfect candidate has been found.
+    """
+
+    seeders_weight: float = Field(default=0.1, ge=0, description="Points per seeder")
+    seeders_cap: float = Field(default=10.0, ge=0, description="Maximum points from seeders")
+    peers_weight: float = Field(default=0.0, ge=0, description="Points per peer")
+    peers_cap: float = Field(default=0.0, ge=0, description="Maximum points from peers")
+    grabs_weight: float = Field(default=0.0, ge=0, description="Points per recorded grab")
+    grabs_cap: float = Field(default=0.0, ge=0, description="Maximum points from grabs")
+    source_bonus: dict[str, float] = Field(
+        default_factory=lambda: {"web-dl": 10.0, "bluray": 8.0, "webrip": 6.0},
+        description="Points per release source"
+    )
+    size_target_gb: float = Field(default=4.0, ge=0, description="Preferred size in GB")
+    size_bonus: float = Field(default=5.0, ge=0, description="Points for a release at the target size")
+    size_penalty_per_gb: float = Field(default=1.0, ge=0, description="Points lost per GB off target")
+    freeleech_bonus: float = Field(default=15.0, ge=0, description="Points when download is freeleech")
+    upload_bonus: float = Field(default=0.0, ge=0, description="Points when upload counts more than 1x")
+
+    def max_score(self) -> float:
+        """Highest score any torrent can reach under this profile"""
+        return (
+            (self.seeders_cap if self.seeders_weight else 0.0)
+            + (self.peers_cap if self.peers_weight else 0.0)
+            + (self.grabs_cap if self.grabs_weight else 0.0)
+            + max([0.0, *self.source_bonus.values()])
+            + self.size_bonus
+            + self.freeleech_bonus
+            + self.upload_bonus
+        )
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
@@ -21,27 +60,103 @@ class Settings(BaseSettings):
     max_concurrent_requests: int = Field(default=10, description="Maximum concurrent HTTP requests")
     request_timeout: float = Field(default=30.0, description="HTTP request timeout in seconds")
     cache_ttl: float = Field(default=300.0, description="Cache TTL in seconds")
+    cache_max_entries: int = Field(default=512, description="Maximum entries per cache before LRU eviction")
+    cache_stale_ttl: float = Field(
+        default=600.0,
+        description="Seconds past expiry a cached entry may be served while it refreshes"
+    )
     rate_limit_per_second: float = Field(default=2.0, description="API rate limit per second")
     rate_limit_burst: int = Field(default=5, description="API rate limit burst size")
+    http_keepalive_expiry: float = Field(default=30.0, description="Idle keep-alive connection expiry in seconds")
+    http2_enabled: bool = Field(default=False, description="Negotiate HTTP/2 with upstreams (requires h2)")
 
     # Radarr settings (for primary path)
     radarr_url: str | None = Field(default=None)
     radarr_api_key: str | None = Field(default=None)
     root_folder: str = Field(default="/movies")
     quality_profile_id: int = Field(default=4)
+    radarr_lookup_ttl: float = Field(default=3600.0, description="Seconds a Radarr movie lookup is cached")
+    bulk_lookup_concurrency: int = Field(default=8, description="Concurrent Radarr lookups in a bulk grab")
+    radarr_library_ttl: float = Field(
+        default=900.0,
+        description="Seconds before the in-memory Radarr library index is resynced in the background"
+    )
+    job_poll_interval: float = Field(
+        default=5.0,
+        description="Seconds between Radarr command/queue polls while acquisitions are active"
+    )
+    job_poll_max_interval: float = Field(
+        default=60.0,
+        description="Upper bound for the acquisition poll interval when backing off"
+    )
+    job_timeout: float = Field(
+        default=1800.0,
+        description="Seconds before an acquisition still searching is marked failed"
+    )
+    job_history_size: int = Field(default=1000, description="Finished acquisition jobs kept in memory")
 
     # Jackett settings (for both paths)
     jackett_url: str | None = Field(default=None)
     jackett_api_key: str | None = Field(default=None)
+    jackett_search_mode: str = Field(
+        default="aggregate",
+        description="Jackett search mode: aggregate (indexers/all) or fanout (per-indexer)"
+    )
+    jackett_id_search: bool = Field(
+        default=True,
+        description="Resolve IMDb ids via Radarr and search indexers by id (t=movie)"
+    )
+    caps_ttl: float = Field(
+        default=86400.0,
+        description="Seconds indexer capabilities are cached before a background refresh"
+    )
+    search_time_budget: float = Field(
+        default=8.0,
+        description="Seconds a fan-out search waits before dropping slow indexers"
+    )
+    search_min_candidates: int = Field(
+        default=1,
+        description="Filtered candidates needed before a fan-out search may stop early"
+    )
 
     # Blackhole settings
     categories: str = Field(default="2000,2010", description="IPTorrents movie categories")
     min_seeders: int = Field(default=20)
     quality_regex: str = Field(default=r"1080p.*WEB-DL|1080p.*BluRay")
-    exclude_regex: str = Field(default=r"CAM|TS|TC|WORKPRINT", description="Quality exclusions")
+    quality_fallbacks: list[str] = Field(
+        default_factory=list,
+        description="Lower quality tier regexes, in order, used when nothing matches quality_regex"
+    )
+    exclude_regex: str = Field(default=DEFAULT_EXCLUDE_REGEX, description="Quality exclusions")
+    release_cache_size: int = Field(default=4096, description="Release names kept in the classifier cache")
     min_size_gb: float = Field(default=2.5, description="Minimum file size in GB")
     max_size_gb: float = Field(default=6.0, description="Maximum file size in GB")
+    candidate_limit: int = Field(default=5, description="Ranked candidates kept per search")
+    scoring_profile: ScoringProfile = Field(
+        default_factory=ScoringProfile,
+        description="Candidate ranking weights, as JSON in SCORING_PROFILE"
+    )
+    recent_poll_interval: float = Field(
+        default=900.0,
+        description="Seconds between polls of the recent releases feed (0 disables)"
+    )
+    recent_index_max_entries: int = Field(default=5000, description="Releases kept in the recent index")
+    recent_index_max_age: float = Field(
+        default=172800.0,
+        description="Seconds a release stays in the recent index after it was last seen"
+    )
     autoadd_watch_dir: str = Field(default="/data/torrents/watch")
+    max_torrent_file_mb: float = Field(default=10.0, description="Largest .torrent file accepted for download")
+    grab_max_attempts: int = Field(default=3, description="Ranked candidates tried before a grab fails")
+    grab_time_budget: float = Field(default=30.0, description="Seconds a grab may spend trying candidates")
+    grab_attempt_timeout: float = Field(
+        default=10.0,
+        description="Seconds one candidate download may take before the next candidate is tried"
+    )
+    grab_race_count: int = Field(
+        default=0,
+        description="Download this many top candidates at once and keep the first valid one (0 or 1 disables)"
+    )
 
     def validate_mode_config(self) -> bool:
         if self.mode == "radarr":
@@ -0,0 +1,76 @@
+"""Cross-indexer deduplication of torrent results."""
+
+import re
+from collections.abc import Iterable
+
+from .torznab import TorrentResult
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def fingerprint(torrent: TorrentResult) -> str:
+    """Identity of a release across indexers
+
+    The infohash when the indexer reports one, otherwise the exact size plus
+    the title with punctuation and separators collapsed.
+    """
+    if torrent.infohash:
+        return torrent.infohash
+    return f"{torrent.size}:{_NON_ALNUM_RE.sub(' ', torrent.title_lower).strip()}"
+
+
+class Deduplicator:
+    """Collapse copies of the same release returned by several indexers.
+
+    The first copy seen is kept. Later copies only contribute their seeder
+    count and freeleech status when those are better than what is recorded.
+    """
+
+    def __init__(self):
+        self._seen: dict[str, TorrentResult] = {}
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, torrents: Iterable[TorrentResult]) -> tuple[list[TorrentResult], list[TorrentResult]]:
+        """Record a batch, returning (new releases, previously seen releases that improved)"""
+        fresh: list[TorrentResult] = []
+        fresh_ids: set[int] = set()
+        improved: dict[int, TorrentResult] = {}
+
+        for torrent in torrents:
+            key = fingerprint(torrent)
+            kept = self._seen.get(key)
+
+            if kept is None:
+                self._seen[key] = torrent
+                fresh.append(torrent)
+                fresh_ids.add(id(torrent))
+                continue
+
+            # Releases still in this batch are scored later with the merged values
+            if self._merge(kept, torrent) and id(kept) not in fresh_ids:
+                improved[id(kept)] = kept
+
+        return fresh, list(improved.values())
+
+    @staticmethod
+    def _merge(kept: TorrentResult, duplicate: TorrentResult) -> bool:
+        """Copy better seeders/freeleech values from a duplicate, reporting any change"""
+        changed = False
+
+        if duplicate.seeders > kept.seeders:
+            kept.seeders = duplicate.seeders
+            kept.peers = max(kept.peers, duplicate.peers)
+            changed = True
+
+        if duplicate.download_volume_factor < kept.download_volume_factor:
+            kept.download_volume_factor = duplicate.download_volume_factor
+            changed = True
+
+        return changed
+
+
+def dedupe(torrents: Iterable[TorrentResult]) -> list[TorrentResult]:
+    """Return one record per release, in first-seen order"""
+    return Deduplicator().add(torrents)[0]
@@ -2,9 +2,8 @@ import asyncio
 import time
 from typing import Any
 
-import httpx
-
 from .config import settings
+from .http_client import http_clients
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -124,29 +123,30 @@ class HealthChecker:
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{settings.radarr_url}/api/v3/system/status",
-                    headers={"X-Api-Key": settings.radarr_api_key}
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "status": "healthy",
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                        "details": {
-                            "version": data.get("version"),
-                            "startup_path": data.get("startupPath"),
-                            "is_debug": data.get("isDebug", False),
-                        }
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                        "error": f"HTTP {response.status_code}: {response.text}"
+            client = http_clients.get("radarr")
+            response = await client.get(
+                f"{settings.radarr_url}/api/v3/system/status",
+                headers={"X-Api-Key": settings.radarr_api_key},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                return {
+                    "status": "healthy",
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "details": {
+                        "version": data.get("version"),
+                        "startup_path": data.get("startupPath"),
+                        "is_debug": data.get("isDebug", False),
                     }
+                }
+            else:
+                return {
+                    "status": "unhealthy",
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "error": f"HTTP {response.status_code}: {response.text}"
+                }
 
         except Exception as e:
             logger.error(f"Radarr health check failed: {e}")
@@ -164,38 +164,40 @@ class HealthChecker:
         start_time = time.time()
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Check server status
-                response = await client.get(
-                    f"{settings.jackett_url}/api/v2.0/server/config",
-                    params={"apikey": settings.jackett_api_key}
+            client = http_clients.get("jackett")
+            # Check server status
+            response = await client.get(
+                f"{settings.jackett_url}/api/v2.0/server/config",
+                params={"apikey": settings.jackett_api_key},
+                timeout=self.timeout
+            )
+
+            if response.status_code == 200:
+                # Check indexers
+                indexers_response = await client.get(
+                    f"{settings.jackett_url}/api/v2.0/indexers",
+                    params={"apikey": settings.jackett_api_key},
+                    timeout=self.timeout
                 )
 
-                if response.status_code == 200:
-                    # Check indexers
-                    indexers_response = await client.get(
-                        f"{settings.jackett_url}/api/v2.0/indexers",
-                        params={"apikey": settings.jackett_api_key}
-                    )
-
-                    indexers_data = indexers_response.json() if indexers_response.status_code == 200 else []
-                    active_indexers = [idx for idx in indexers_data if idx.get("configured", False)]
-
-                    return {
-                        "status": "healthy" if active_indexers else "degraded",
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                        "details": {
-                            "total_indexers": len(indexers_data),
-                            "active_indexers": len(active_indexers),
-                            "indexer_names": [idx.get("name") for idx in active_indexers[:5]]  # First 5
-                        }
-                    }
-                else:
-                    return {
-                        "status": "unhealthy",
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                        "error": f"HTTP {response.status_code}: {response.text}"
+                indexers_data = indexers_response.json() if indexers_response.status_code == 200 else []
+                active_indexers = [idx for idx in indexers_data if idx.get("configured", False)]
+
+                return {
+                    "status": "healthy" if active_indexers else "degraded",
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "details": {
+                        "total_indexers": len(indexers_data),
+                        "active_indexers": len(active_indexers),
+                        "indexer_names": [idx.get("name") for idx in active_indexers[:5]]  # First 5
                     }
+                }
+            else:
+                return {
+                    "status": "unhealthy",
+                    "duration_ms": round((time.time() - start_time) * 1000, 2),
+                    "error": f"HTTP {response.status_code}: {response.text}"
+                }
 
         except Exception as e:
             logger.error(f"Jackett health check failed: {e}")
@@ -0,0 +1,94 @@
+"""Shared, long-lived HTTP clients for upstream services."""
+
+import httpx
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Upstream services that get their own connection pool
+UPSTREAMS = ("radarr", "jackett", "downloads")
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 dependency is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientManager:
+    """Owns one pooled httpx.AsyncClient per upstream service.
+
+    Clients are opened in the application lifespan and reused across requests
+    so connections stay alive between calls. If a client is requested before
+    startup (scripts, tests) it is created lazily.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.max_concurrent_requests,
+            max_keepalive_connections=settings.max_concurrent_requests,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+
+        http2 = settings.http2_enabled
+        if http2 and not _http2_available():
+            logger.warning(
+                "HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1",
+                extra={'event': 'http2_unavailable'}
+            )
+            http2 = False
+
+        return httpx.AsyncClient(
+            timeout=settings.request_timeout,
+            limits=limits,
+            http2=http2,
+            follow_redirects=True,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the pooled client for an upstream, creating it if needed."""
+        if name not in UPSTREAMS:
+            raise KeyError(f"Unknown upstream: {name}")
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[name] = client
+        return client
+
+    async def startup(self) -> None:
+        """Open a pooled client for every upstream."""
+        for name in UPSTREAMS:
+            self.get(name)
+
+        logger.info(
+            "HTTP client pools opened",
+            extra={
+                'event': 'http_clients_started',
+                'upstreams': list(UPSTREAMS),
+                'max_connections': settings.max_concurrent_requests,
+                'http2': settings.http2_enabled,
+            }
+        )
+
+    async def close(self) -> None:
+        """Close all pooled clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+
+        for client in clients:
+            await client.aclose()
+
+        logger.info("HTTP client pools closed", extra={'event': 'http_clients_closed'})
+
+
+# Global client manager instance
+http_clients = HTTPClientManager()
@@ -1,13 +1,33 @@
+import asyncio
 import logging
 import re
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Callable
 from typing import Any
 
 import httpx
 
-from .config import settings
+from .config import ScoringProfile, Settings, settings
+from .dedup import Deduplicator, dedupe
+from .http_client import http_clients
+from .performance import AsyncCache, SingleFlight
+from .recent import RecentReleaseIndex
+from .release import ReleaseClassifier
+from .scoring import CompiledProfile, TopKSelector, rank_key
+from .torznab import (
+    IndexerCapabilities,
+    TorrentResult,
+    TorznabStreamParser,
+    parse_caps,
+    parse_feed,
+)
 
 logger = logging.getLogger(__name__)
 
+# Hook applied to batches of items while a feed is parsed: returns the items to keep
+Evaluator = Callable[[list[TorrentResult]], list[TorrentResult]]
+
 
 class JackettClient:
     def __init__(self):
@@ -19,183 +39,566 @@ class JackettClient:
         self.exclude_regex = re.compile(settings.exclude_regex, re.IGNORECASE)
         self.min_size_bytes = int(settings.min_size_gb * 1024 * 1024 * 1024)
         self.max_size_bytes = int(settings.max_size_gb * 1024 * 1024 * 1024)
+        self.classifier = ReleaseClassifier(
+            self.quality_regex,
+            self.exclude_regex,
+            settings.release_cache_size,
+            [re.compile(regex, re.IGNORECASE) for regex in settings.quality_fallbacks]
+        )
+        self.search_mode = settings.jackett_search_mode
+        self.search_time_budget = settings.search_time_budget
+        self.search_min_candidates = settings.search_min_candidates
+        self.indexer_list_ttl = settings.cache_ttl
+        self._indexers: list[str] = []
+        self._indexers_fetched_at = 0.0
+        self.candidate_limit = settings.candidate_limit
+        self.search_cache = AsyncCache(
+            default_ttl=settings.cache_ttl,
+            max_size=settings.cache_max_entries,
+            stale_ttl=settings.cache_stale_ttl
+        )
+        self._inflight = SingleFlight()
+        self.caps_cache = AsyncCache(
+            default_ttl=settings.caps_ttl,
+            max_size=256,
+            stale_ttl=settings.caps_ttl
+        )
+        self.recent_index = RecentReleaseIndex(
+            max_entries=settings.recent_index_max_entries,
+            max_age=settings.recent_index_max_age
+        )
+        self.recent_poll_interval = settings.recent_poll_interval
+        self._recent_task: asyncio.Task | None = None
+        self.id_search = settings.jackett_id_search and bool(
+            settings.radarr_url and settings.radarr_api_key
+        )
+        self._apply_scoring_profile(settings.scoring_profile)
+
+    def _apply_scoring_profile(self, profile: ScoringProfile) -> None:
+        self.scoring = CompiledProfile(profile)
+
+    async def reload_scoring_profile(self, profile: ScoringProfile | None = None) -> ScoringProfile:
+        """Recompile the scoring profile, re-reading it from the environment if not given
+
+        Cached rankings were made with the old weights, so they are dropped.
+        """
+        if profile is None:
+            profile = Settings().scoring_profile
+
+        self._apply_scoring_profile(profile)
+        await self.search_cache.clear()
+
+        logger.info(f"Scoring profile reloaded (max score {self.scoring.max_score:.1f})")
+        return profile
+
+    async def search_torrents(
+        self,
+        query: str,
+        evaluate: Evaluator | None = None,
+        done: Callable[[], bool] | None = None,
+        imdb_id: str | None = None
+    ) -> list[TorrentResult]:
+        """Search for torrents using Jackett's Torznab API
+
+        If ``evaluate`` is given it runs on the items parsed from each chunk of
+        the response and only the items it returns are kept. Reading stops early once
+        ``done`` returns True. With ``imdb_id`` an ID-based movie search
+        (``t=movie``) is issued instead of a free-text one.
+        """
+
+        if imdb_id:
+            params = {
+                "apikey": self.api_key,
+                "t": "movie",
+                "cat": self.categories,
+                "imdbid": imdb_id
+            }
+        else:
+            params = {
+                "apikey": self.api_key,
+                "t": "search",
+                "cat": self.categories,
+                "q": query
+            }
+
+        if evaluate is None and done is None:
+            # Plain searches have no per-caller hooks, so identical ones can share a request
+            return await self._inflight.do(
+                f"search:{self._cache_key(query, 0, imdb_id)}",
+                lambda: self._search(query, params)
+            )
+
+        return await self._search(query, params, evaluate, done)
+
+    async def _search(
+        self,
+        query: str,
+        params: dict[str, Any],
+        evaluate: Evaluator | None = None,
+        done: Callable[[], bool] | None = None
+    ) -> list[TorrentResult]:
+        """Run a search in the configured mode"""
+        if self.search_mode == "fanout":
+            return await self._search_fanout(query, params, evaluate, done)
 
-    async def search_torrents(self, query: str) -> list[dict[str, Any]]:
-        """Search for torrents using Jackett's Torznab API"""
+        try:
+            results = await self._search_indexer("all", params, evaluate, done)
+
+            logger.info(f"Found {len(results)} raw results for '{query}'")
+            return results
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error searching Jackett: {e}")
+            raise
+
+    async def _search_indexer(
+        self,
+        indexer: str,
+        params: dict[str, Any],
+        evaluate: Evaluator | None = None,
+        done: Callable[[], bool] | None = None
+    ) -> list[TorrentResult]:
+        """Query a single indexer's Torznab endpoint ('all' for the aggregate)
+
+        The feed is parsed incrementally from the response stream so large
+        result sets are never held in memory as a whole.
+        """
+        client = http_clients.get("jackett")
+        results = []
 
-        params = {
-            "apikey": self.api_key,
-            "t": "search",
-            "cat": self.categories,
-            "q": query
-        }
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/api/v2.0/indexers/{indexer}/results/torznab",
+            params=params
+        ) as response:
+            response.raise_for_status()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+            parser = TorznabStreamParser()
             try:
-                response = await client.get(
-                    f"{self.base_url}/api/v2.0/indexers/all/results/torznab",
-                    params=params
-                )
-                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    self._collect(parser.feed(chunk), results, evaluate)
 
-                # Parse XML response and convert to dict
-                results = self._parse_torznab_response(response.text)
+                    if done is not None and done():
+                        logger.debug(f"Selection settled, stopped reading '{indexer}' early")
+                        return results
+                self._collect(parser.close(), results, evaluate)
 
-                logger.info(f"Found {len(results)} raw results for '{query}'")
-                return results
+            except ET.ParseError as e:
+                logger.error(f"Error parsing XML response from '{indexer}': {e}")
 
-            except httpx.HTTPError as e:
-                logger.error(f"Error searching Jackett: {e}")
-                raise
+        return results
+
+    def _collect(
+        self,
+        items: list[TorrentResult],
+        results: list[TorrentResult],
+        evaluate: Evaluator | None
+    ) -> None:
+        """Append the items parsed from one chunk, passing them through the evaluator"""
+        if evaluate is None:
+            results.extend(items)
+        elif items:
+            results.extend(evaluate(items))
+
+    async def list_indexers(self) -> list[str]:
+        """Return the ids of configured Jackett indexers, cached for a short while"""
+        if self._indexers and time.monotonic() - self._indexers_fetched_at < self.indexer_list_ttl:
+            return self._indexers
+
+        client = http_clients.get("jackett")
+        response = await client.get(
+            f"{self.base_url}/api/v2.0/indexers",
+            params={"apikey": self.api_key, "configured": "true"}
+        )
+        response.raise_for_status()
+
+        self._indexers = [
+            idx["id"] for idx in response.json()
+            if idx.get("configured", False) and idx.get("id")
+        ]
+        self._indexers_fetched_at = time.monotonic()
+        return self._indexers
+
+    async def _search_fanout(
+        self,
+        query: str,
+        params: dict[str, Any],
+        evaluate: Evaluator | None = None,
+        done: Callable[[], bool] | None = None
+    ) -> list[TorrentResult]:
+        """Query every configured indexer concurrently and merge results as they arrive.
+
+        Once the time budget has elapsed and at least ``search_min_candidates``
+        results pass the quality filters, slower indexers are cancelled.
+        """
+        try:
+            indexers = await self.list_indexers()
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not list Jackett indexers, using aggregate search: {e}")
+            indexers = []
+
+        if not indexers:
+            return await self._search_indexer("all", params, evaluate, done)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.search_time_budget
+
+        tasks = {
+            asyncio.create_task(
+                self._search_capable_indexer(indexer, query, params, evaluate, done)
+            ): indexer
+            for indexer in indexers
+        }
+        pending = set(tasks)
+        results: list[TorrentResult] = []
+        candidates = 0
+        errors: list[Exception] = []
+
+        try:
+            while pending:
+                if done is not None and done():
+                    break
+
+                remaining = deadline - loop.time()
+                enough = candidates >= self.search_min_candidates
+                if enough and remaining <= 0:
+                    break
+
+                finished, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining if enough else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
 
-    def _parse_torznab_response(self, xml_content: str) -> list[dict[str, Any]]:
-        """Parse Torznab XML response into list of torrent dictionaries"""
-        import xml.etree.ElementTree as ET
+                for task in finished:
+                    indexer = tasks[task]
+                    try:
+                        batch = task.result()
+                    except httpx.HTTPError as e:
+                        logger.warning(f"Indexer '{indexer}' search failed: {e}")
+                        errors.append(e)
+                        continue
+
+                    results.extend(batch)
+                    if evaluate is not None:
+                        candidates += len(batch)
+                    else:
+                        candidates += sum(1 for torrent in batch if self._passes_filters(torrent))
+                    logger.debug(f"Indexer '{indexer}' returned {len(batch)} results")
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if errors and len(errors) == len(tasks):
+            logger.error(f"Error searching Jackett: all {len(tasks)} indexers failed")
+            raise errors[-1]
+
+        if pending:
+            logger.info(
+                f"Search budget reached, skipped {len(pending)} slow indexers for '{query}'"
+            )
+
+        logger.info(f"Found {len(results)} raw results for '{query}' from {len(tasks)} indexers")
+        return results
 
-        results = []
+    async def get_capabilities(self, indexer: str) -> IndexerCapabilities | None:
+        """Return an indexer's Torznab capabilities, or None if they are unavailable
 
+        Capabilities are cached for CAPS_TTL and refreshed in the background
+        once they expire.
+        """
         try:
-            root = ET.fromstring(xml_content)
-
-            # Find all items in the RSS feed
-            for item in root.findall(".//item"):
-                torrent = {}
-
-                # Basic fields
-                torrent["title"] = self._get_text(item.find("title"))
-                torrent["link"] = self._get_text(item.find("link"))
-                torrent["guid"] = self._get_text(item.find("guid"))
-                torrent["pubDate"] = self._get_text(item.find("pubDate"))
-                torrent["description"] = self._get_text(item.find("description"))
-
-                # Parse torznab attributes
-                for attr in item.findall(".//{http://torznab.com/schemas/2015/feed}attr"):
-                    name = attr.get("name")
-                    value = attr.get("value")
-
-                    if name == "size":
-                        torrent["size"] = int(value) if value else 0
-                    elif name == "seeders":
-                        torrent["seeders"] = int(value) if value else 0
-                    elif name == "peers":
-                        torrent["peers"] = int(value) if value else 0
-                    elif name == "downloadvolumefactor":
-                        torrent["downloadvolumefactor"] = float(value) if value else 1.0
-                    elif name == "uploadvolumefactor":
-                        torrent["uploadvolumefactor"] = float(value) if value else 1.0
-                    elif name == "grabs":
-                        torrent["grabs"] = int(value) if value else 0
-
-                # Extract download URL from enclosure or link
-                enclosure = item.find("enclosure")
-                if enclosure is not None:
-                    torrent["download_url"] = enclosure.get("url")
-                else:
-                    torrent["download_url"] = torrent.get("link")
-
-                results.append(torrent)
+            return await self.caps_cache.get_or_load(
+                indexer,
+                lambda: self._inflight.do(f"caps:{indexer}", lambda: self._fetch_capabilities(indexer))
+            )
+        except (httpx.HTTPError, ET.ParseError) as e:
+            logger.warning(f"Could not fetch capabilities for '{indexer}': {e}")
+            return None
 
-        except ET.ParseError as e:
-            logger.error(f"Error parsing XML response: {e}")
+    async def _fetch_capabilities(self, indexer: str) -> IndexerCapabilities:
+        client = http_clients.get("jackett")
+        response = await client.get(
+            f"{self.base_url}/api/v2.0/indexers/{indexer}/results/torznab",
+            params={"apikey": self.api_key, "t": "caps"}
+        )
+        response.raise_for_status()
+        return parse_caps(response.content)
+
+    def _params_for_indexer(
+        self, caps: IndexerCapabilities | None, query: str, params: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        """Adapt search params to what an indexer supports, or None to skip it"""
+        if caps is None:
+            return params
+
+        adapted = dict(params)
+
+        if params["t"] == "movie" and not caps.supports_movie_param("imdbid"):
+            # No ID search on this indexer: fall back to a free-text query
+            adapted.pop("imdbid", None)
+            adapted["t"] = "search"
+            adapted["q"] = query
+
+        if adapted["t"] == "search" and not caps.search_available:
+            if not caps.supports_movie_param("q"):
+                return None
+            adapted["t"] = "movie"
+
+        if caps.categories:
+            wanted = [cat for cat in self.categories.split(",") if cat.strip() in caps.categories]
+            if not wanted:
+                return None
+            adapted["cat"] = ",".join(wanted)
+
+        return adapted
+
+    async def _search_capable_indexer(
+        self,
+        indexer: str,
+        query: str,
+        params: dict[str, Any],
+        evaluate: Evaluator | None = None,
+        done: Callable[[], bool] | None = None
+    ) -> list[TorrentResult]:
+        """Search one indexer using only the query form and categories it serves"""
+        caps = await self.get_capabilities(indexer)
+        indexer_params = self._params_for_indexer(caps, query, params)
+
+        if indexer_params is None:
+            logger.debug(f"Skipping indexer '{indexer}' - cannot serve this query")
             return []
 
-        return results
+        return await self._search_indexer(indexer, indexer_params, evaluate, done)
 
-    def _get_text(self, element) -> str:
-        """Safely get text from XML element"""
-        return element.text if element is not None else ""
+    def _parse_torznab_response(self, xml_content: str | bytes) -> list[TorrentResult]:
+        """Parse a complete Torznab XML response into a list of torrent records"""
+        try:
+            return parse_feed(xml_content)
+        except ET.ParseError as e:
+            logger.error(f"Error parsing XML response: {e}")
+            return []
 
-    def filter_torrents(self, torrents: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def filter_torrents(self, torrents: list[TorrentResult]) -> list[TorrentResult]:
         """Filter torrents based on quality, size, and seeder requirements"""
-        filtered = []
+        # Copies of a release from several indexers are scored once
+        filtered = self._select(dedupe(torrents))
 
-        for torrent in torrents:
-            title = torrent.get("title", "")
-            size = torrent.get("size", 0)
-            seeders = torrent.get("seeders", 0)
-
-            # Check seeders
-            if seeders < self.min_seeders:
-                logger.debug(f"Skipping '{title}' - insufficient seeders ({seeders})")
-                continue
-
-            # Check size limits
-            if size < self.min_size_bytes or size > self.max_size_bytes:
-                size_gb = size / (1024 * 1024 * 1024)
-                logger.debug(f"Skipping '{title}' - size {size_gb:.1f}GB outside limits")
-                continue
-
-            # Check quality regex
-            if not self.quality_regex.search(title):
-                logger.debug(f"Skipping '{title}' - doesn't match quality regex")
-                continue
-
-            # Check exclude regex
-            if self.exclude_regex.search(title):
-                logger.debug(f"Skipping '{title}' - matches exclude regex")
-                continue
-
-            # Add calculated score for sorting
-            torrent["score"] = self._calculate_score(torrent)
-            filtered.append(torrent)
-
-        # Sort by score (highest first)
-        filtered.sort(key=lambda x: x["score"], reverse=True)
+        # Sort by quality tier, then score (best first)
+        filtered.sort(key=rank_key, reverse=True)
 
         logger.info(f"Filtered to {len(filtered)} quality torrents")
         return filtered
 
-    def _calculate_score(self, torrent: dict[str, Any]) -> float:
+    def _select(self, torrents: list[TorrentResult]) -> list[TorrentResult]:
+        """Filter and score a batch of torrents, keeping input order"""
+        filtered = []
+        for torrent in torrents:
+            if self._evaluate(torrent) is not None:
+                filtered.append(torrent)
+        return filtered
+
+    def _evaluate(self, torrent: TorrentResult) -> TorrentResult | None:
+        """Filter and score a single torrent, returning None if it is rejected"""
+        if not self._passes_filters(torrent):
+            return None
+
+        # Add calculated score for sorting
+        torrent.score = self._calculate_score(torrent)
+        return torrent
+
+    def _passes_filters(self, torrent: TorrentResult) -> bool:
+        """Check a torrent against the seeder, size and quality requirements"""
+        title = torrent.title
+        size = torrent.size
+        seeders = torrent.seeders
+
+        # Check seeders
+        if seeders < self.min_seeders:
+            logger.debug(f"Skipping '{title}' - insufficient seeders ({seeders})")
+            return False
+
+        # Check size limits
+        if size < self.min_size_bytes or size > self.max_size_bytes:
+            logger.debug(f"Skipping '{title}' - size {torrent.size_gb:.1f}GB outside limits")
+            return False
+
+        release = self.classifier.classify_torrent(torrent)
+
+        # Check quality regex and fallback tiers
+        if not release.quality_match:
+            logger.debug(f"Skipping '{title}' - doesn't match any quality tier")
+            return False
+
+        # Check exclude regex
+        if release.excluded:
+            logger.debug(f"Skipping '{title}' - matches exclude regex")
+            return False
+
+        return True
+
+    def _calculate_score(self, torrent: TorrentResult) -> float:
         """Calculate quality score for torrent ranking"""
-        score = 0.0
-        title = torrent.get("title", "").lower()
-        seeders = torrent.get("seeders", 0)
-        size = torrent.get("size", 0)
-
-        # Seeder score (logarithmic)
-        score += min(seeders / 10.0, 10.0)
-
-        # Quality preference scoring
-        if "web-dl" in title:
-            score += 10
-        elif "bluray" in title or "blu-ray" in title:
-            score += 8
-        elif "webrip" in title:
-            score += 6
-
-        # Size preference (closer to 4GB is better)
-        size_gb = size / (1024 * 1024 * 1024)
-        size_diff = abs(size_gb - 4.0)
-        score += max(0, 5 - size_diff)
-
-        # Freeleech bonus
-        if torrent.get("downloadvolumefactor", 1.0) == 0.0:
-            score += 15
-
-        return score
-
-    async def get_best_torrent(self, title: str, year: int | None = None) -> dict[str, Any] | None:
-        """Search and return the best quality torrent for a movie"""
+        # The compiled profile reads the release source, so classify first
+        self.classifier.classify_torrent(torrent)
+        return self.scoring.score(torrent)
+
+    async def select_torrents(
+        self, query: str, limit: int | None = None, imdb_id: str | None = None
+    ) -> list[TorrentResult]:
+        """Search and return the top ``limit`` torrents, best first
+
+        Candidates are kept in a bounded heap while results stream in, and the
+        search stops reading once no remaining result could improve the set.
+        Rankings are cached per normalized query and category set; expired
+        entries are served while a background search refreshes them.
+        """
+        limit = limit or self.candidate_limit
+        key = self._cache_key(query, limit, imdb_id)
+
+        return await self.search_cache.get_or_load(
+            key,
+            # Concurrent misses for the same key share one upstream search
+            lambda: self._inflight.do(
+                f"select:{key}", lambda: self._select_uncached(query, limit, imdb_id)
+            ),
+            # Empty rankings are not cached so a new release shows up on retry
+            should_cache=bool
+        )
+
+    def _cache_key(self, query: str, limit: int, imdb_id: str | None = None) -> str:
+        """Build the search cache key from the normalized query and categories"""
+        if imdb_id:
+            return f"{self.categories}:{limit}:imdb:{imdb_id}"
+        normalized = " ".join(query.lower().split())
+        return f"{self.categories}:{limit}:{normalized}"
+
+    async def _select_uncached(
+        self, query: str, limit: int, imdb_id: str | None = None
+    ) -> list[TorrentResult]:
+        """Run a streaming search and keep the top ``limit`` distinct candidates"""
+        selector = TopKSelector(limit, self.scoring.max_score)
+        dedup = Deduplicator()
+
+        def evaluate(batch: list[TorrentResult]) -> list[TorrentResult]:
+            fresh, improved = dedup.add(batch)
+            if improved:
+                # A later copy raised seeders or freeleech status: rescore the kept record
+                selector.update([t for t in improved if self._evaluate(t) is not None])
+            return selector.offer_all(self._select(fresh))
+
+        await self.search_torrents(
+            query, evaluate=evaluate, done=lambda: selector.settled, imdb_id=imdb_id
+        )
+        return selector.ranked()
+
+    async def resolve_imdb_id(self, title: str, year: int | None = None) -> str | None:
+        """Resolve a movie title to its IMDb id through Radarr's lookup endpoint"""
+        from .radarr import radarr_client
+
+        try:
+            results = await radarr_client.search_movie(title, year)
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not resolve IMDb id for '{title}': {e}")
+            return None
+
+        if not results:
+            return None
+
+        return radarr_client.pick_movie(results, year).get("imdbId") or None
+
+    async def refresh_recent(self) -> int:
+        """Pull the latest releases from the aggregate feed into the recent index"""
+        params = {"apikey": self.api_key, "t": "search", "cat": self.categories}
+        results = await self._search_indexer("all", params)
+        added = self.recent_index.add(results)
+
+        logger.debug(f"Recent feed returned {len(results)} releases, {added} new")
+        return added
+
+    async def _recent_poll_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh_recent()
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not poll recent releases: {e}")
+            except Exception as e:
+                # A malformed feed must not stop polling for the rest of the process
+                logger.error(f"Unexpected error polling recent releases: {e}", exc_info=True)
+            await asyncio.sleep(self.recent_poll_interval)
+
+    def start_recent_poll(self) -> None:
+        """Start polling the recent feed in the background, if enabled"""
+        if self.recent_poll_interval > 0 and self._recent_task is None:
+            self._recent_task = asyncio.create_task(self._recent_poll_loop())
+
+    async def stop_recent_poll(self) -> None:
+        if self._recent_task is None:
+            return
+        self._recent_task.cancel()
+        try:
+            await self._recent_task
+        except asyncio.CancelledError:
+            pass
+        self._recent_task = None
+
+    def lookup_recent(self, title: str, year: int | None = None) -> list[TorrentResult]:
+        """Return recently seen releases for a movie that pass the filters, best first"""
+        matches = self.recent_index.lookup(title, year)
+        return self.filter_torrents(matches)[:self.candidate_limit] if matches else []
+
+    async def get_ranked_torrents(self, title: str, year: int | None = None) -> list[TorrentResult]:
+        """Search and return the ranked candidates for a movie, best first"""
 
         # Construct search query
         query = f"{title} {year}" if year else title
 
-        # Search for torrents
-        raw_results = await self.search_torrents(query)
+        # Answer from recently polled releases before searching trackers live,
+        # but only with a preferred-tier match; anything lower may be beaten
+        # by a live result, and indexed seeder counts can be stale
+        indexed = self.lookup_recent(title, year)
+        if indexed and indexed[0].release.tier == 0:
+            logger.info(f"Found {len(indexed)} recent candidates for '{query}'")
+            return indexed
 
-        if not raw_results:
-            return None
+        # Prefer an ID-based search: fewer, more relevant results
+        candidates: list[TorrentResult] = []
+        imdb_id = await self.resolve_imdb_id(title, year) if self.id_search else None
 
-        # Filter based on quality requirements
-        filtered_results = self.filter_torrents(raw_results)
+        if imdb_id:
+            candidates = await self.select_torrents(query, imdb_id=imdb_id)
+            if not candidates:
+                logger.info(f"No results for {imdb_id}, falling back to text search for '{query}'")
 
-        if not filtered_results:
+        # Search for torrents, filtering and scoring items as they are parsed
+        if not candidates:
+            candidates = await self.select_torrents(query)
+
+        if not candidates and indexed:
+            logger.info(f"No live results for '{query}', using {len(indexed)} recent candidates")
+            candidates = indexed
+
+        if not candidates:
             logger.warning(f"No torrents found matching quality criteria for '{query}'")
+            return []
+
+        best_tier = candidates[0].release.tier if candidates[0].release is not None else None
+        if best_tier:
+            logger.info(f"No preferred quality for '{query}', using fallback tier {best_tier}")
+
+        return candidates
+
+    async def get_best_torrent(self, title: str, year: int | None = None) -> TorrentResult | None:
+        """Search and return the best quality torrent for a movie"""
+        candidates = await self.get_ranked_torrents(title, year)
+        if not candidates:
             return None
 
         # Return the best result
-        best_torrent = filtered_results[0]
-        logger.info(f"Selected torrent: {best_torrent['title']} (Score: {best_torrent['score']:.1f})")
+        best_torrent = candidates[0]
+        logger.info(f"Selected torrent: {best_torrent.title} (Score: {best_torrent.score:.1f})")
 
         return best_torrent
 
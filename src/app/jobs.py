@@ -0,0 +1,225 @@
+"""
+Background tracking of Radarr acquisitions.
+
+Submitting an acquisition only records a job and returns its id. The Radarr
+lookup, add and search run in a background task, and a single poll loop then
+follows every searching job through Radarr's command list and download queue
+until the outcome is known.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+import httpx
+
+from .config import settings
+from .logging_config import get_logger
+from .models import AcquisitionJob
+from .radarr import radarr_client
+
+logger = get_logger(__name__)
+
+FINAL_STATUSES = frozenset({"grabbed", "available", "no_release", "not_found", "failed"})
+
+# Radarr command states that end a search without a grab
+_FAILED_COMMAND_STATUSES = frozenset({"failed", "aborted", "cancelled", "orphaned"})
+
+# Polls a search must stay completed without a queue entry before it counts
+# as finding nothing, so a grab still being handed to the client is not missed
+_SETTLE_POLLS = 2
+
+
+class AcquisitionTracker:
+    """Accepts acquisitions immediately and tracks their outcome in Radarr."""
+
+    def __init__(self):
+        self._jobs: OrderedDict[str, AcquisitionJob] = OrderedDict()
+        self._active: dict[str, float] = {}  # job id -> monotonic activation time
+        self._settled: dict[str, int] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._poll_task: asyncio.Task | None = None
+        self.interval = settings.job_poll_interval
+        self.max_interval = settings.job_poll_max_interval
+        self.timeout = settings.job_timeout
+        self.history_size = settings.job_history_size
+
+    def submit(self, title: str, year: int | None = None) -> AcquisitionJob:
+        """Record an acquisition and start it in the background"""
+        now = datetime.now().isoformat()
+        job = AcquisitionJob(
+            id=str(uuid.uuid4()),
+            title=title,
+            year=year,
+            created_at=now,
+            updated_at=now
+        )
+        self._jobs[job.id] = job
+        self._prune()
+
+        task = asyncio.create_task(self._start(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(
+            f"Accepted acquisition for {title} ({year})",
+            extra={'event': 'acquisition_accepted', 'job_id': job.id, 'title': title, 'year': year}
+        )
+        return job
+
+    def get(self, job_id: str) -> AcquisitionJob | None:
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        """Cancel pending starts and the poll loop"""
+        tasks = list(self._tasks)
+        if self._poll_task is not None:
+            tasks.append(self._poll_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._poll_task = None
+
+    async def _start(self, job: AcquisitionJob) -> None:
+        """Resolve the movie, add it without searching, then trigger the search"""
+        try:
+            results = await radarr_client.search_movie(job.title, job.year)
+            if not results:
+                self._update(job, "not_found", f"No movies found for '{job.title}'")
+                return
+
+            movie = radarr_client.pick_movie(results, job.year)
+            job.tmdb_id = movie.get("tmdbId")
+
+            radarr_client.ensure_library()
+            existing = radarr_client.library.get(movie.get("tmdbId"), movie.get("imdbId"))
+
+            if existing is not None and existing.get("hasFile"):
+                job.movie_id = existing.get("id")
+                self._update(job, "available", f"'{existing['title']}' is already downloaded in Radarr")
+                return
+
+            if existing is None:
+                existing = await radarr_client.add_movie(movie, search=False)
+            elif not existing.get("monitored", True):
+                await radarr_client.monitor_movie(existing)
+
+            job.movie_id = existing["id"]
+            command = await radarr_client.search_existing(job.movie_id)
+            job.command_id = command.get("id")
+
+        except httpx.HTTPError as e:
+            self._update(job, "failed", f"Radarr request failed: {e}")
+            return
+        except Exception as e:
+            # An unexpected payload must not leave the job accepted forever
+            logger.error(
+                f"Acquisition {job.id} for {job.title} failed: {e}",
+                extra={'event': 'acquisition_error', 'job_id': job.id, 'error': str(e)}
+            )
+            self._update(job, "failed", f"Unexpected error: {e}")
+            return
+
+        self._update(job, "searching", "Radarr is searching for a release")
+        self._active[job.id] = time.monotonic()
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        """Poll Radarr once per cycle for all searching jobs
+
+        The interval resets to JOB_POLL_INTERVAL whenever a job changes state
+        and doubles, up to JOB_POLL_MAX_INTERVAL, after idle or failed polls.
+        """
+        interval = self.interval
+        while self._active:
+            await asyncio.sleep(interval)
+            try:
+                changed = await self.poll_once()
+            except Exception as e:
+                # Keep polling through any failure; searching jobs depend on it
+                logger.warning(
+                    f"Acquisition poll failed: {e}",
+                    extra={'event': 'acquisition_poll_failed', 'active': len(self._active)}
+                )
+                changed = 0
+
+            interval = self.interval if changed else min(interval * 2, self.max_interval)
+
+    async def poll_once(self) -> int:
+        """Check every searching job against one command list and one queue read
+
+        Returns the number of jobs that reached an outcome.
+        """
+        if not self._active:
+            return 0
+
+        commands, queue = await asyncio.gather(radarr_client.get_commands(), radarr_client.get_queue())
+        commands_by_id = {command.get("id"): command for command in commands}
+        queued = {record.get("movieId") for record in queue}
+        now = time.monotonic()
+        finished = 0
+
+        for job_id, activated in list(self._active.items()):
+            job = self._jobs.get(job_id)
+            if job is None:
+                self._deactivate(job_id)
+                continue
+
+            command = commands_by_id.get(job.command_id)
+            command_status = command.get("status") if command else None
+
+            if job.movie_id in queued:
+                self._update(job, "grabbed", "Release grabbed and queued for download")
+            elif command_status in _FAILED_COMMAND_STATUSES:
+                reason = command.get("message") or command.get("exception") or command_status
+                self._update(job, "failed", f"Radarr search {command_status}: {reason}")
+            elif command_status == "completed" or command is None:
+                # A command that aged out of Radarr's list has finished too
+                self._settled[job_id] = self._settled.get(job_id, 0) + 1
+                if self._settled[job_id] < _SETTLE_POLLS:
+                    continue
+                self._update(job, "no_release", "Search completed without grabbing a release")
+            elif now - activated > self.timeout:
+                self._update(job, "failed", "Timed out waiting for Radarr search")
+            else:
+                continue
+
+            self._deactivate(job_id)
+            finished += 1
+
+        return finished
+
+    def _deactivate(self, job_id: str) -> None:
+        self._active.pop(job_id, None)
+        self._settled.pop(job_id, None)
+
+    def _update(self, job: AcquisitionJob, status: str, message: str) -> None:
+        job.status = status
+        job.message = message
+        job.updated_at = datetime.now().isoformat()
+
+        logger.info(
+            f"Acquisition {job.id} for {job.title}: {status}",
+            extra={
+                'event': 'acquisition_status',
+                'job_id': job.id,
+                'title': job.title,
+                'status': status,
+                'movie_id': job.movie_id
+            }
+        )
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond JOB_HISTORY_SIZE"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.status in FINAL_STATUSES][:excess]:
+            del self._jobs[job_id]
+
+
+# Global tracker instance
+acquisition_tracker = AcquisitionTracker()
@@ -1,12 +1,18 @@
 from contextlib import asynccontextmanager
 from datetime import datetime
 import os
+import secrets
 
 from fastapi import Depends, FastAPI, HTTPException, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+)
 
 from .blackhole import blackhole_client
 from .config import settings
@@ -18,12 +24,20 @@ from .error_handlers import (
 )
 from .exceptions import SeederBotException
 from .health import health_checker
+from .http_client import http_clients
+from .jackett import jackett_client
+from .jobs import acquisition_tracker
 from .logging_config import get_logger, setup_logging
 from .middleware import RequestLoggingMiddleware
 from .models import (
+    AcquisitionJob,
+    AcquisitionResponse,
+    BulkGrabRequest,
+    BulkGrabResponse,
     GrabRequest,
     GrabResponse,
     HealthResponse,
+    RadarrWebhook,
     SimpleHealthResponse,
     WatchlistRequest,
     WatchlistResponse,
@@ -38,6 +52,7 @@ logger = get_logger(__name__)
 
 # Security
 security = HTTPBearer()
+webhook_security = HTTPBasic()
 
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -50,6 +65,17 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     return credentials.credentials
 
 
+def verify_webhook(credentials: HTTPBasicCredentials = Depends(webhook_security)):
+    # Radarr's webhook connection only sends basic auth; the password carries the app token
+    if not secrets.compare_digest(credentials.password.encode(), settings.app_token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+    return credentials.password
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -81,10 +107,35 @@ async def lifespan(app: FastAPI):
             extra={'event': 'config_validation_success', 'mode': settings.mode}
         )
 
+    # Open pooled upstream connections
+    await http_clients.startup()
+
+    # Keep an index of recent releases so popular grabs skip the live search
+    if settings.mode == "blackhole" and config_valid:
+        jackett_client.start_recent_poll()
+
+    # Know what is already in the watch directory before the first grab
+    if settings.mode == "blackhole":
+        await blackhole_client.startup()
+
+    # Index the Radarr library so grabs for existing movies skip the add
+    if settings.mode == "radarr" and config_valid:
+        try:
+            await radarr_client.sync_library()
+        except Exception as e:
+            logger.warning(
+                "Could not load Radarr library",
+                extra={'event': 'radarr_library_failed', 'error': str(e)}
+            )
+
     yield
 
     # Shutdown
     logger.info("Shutting down SeederBot", extra={'event': 'shutdown'})
+    await jackett_client.stop_recent_poll()
+    await acquisition_tracker.close()
+    await radarr_client.close()
+    await http_clients.close()
 
 
 app = FastAPI(
@@ -170,16 +221,22 @@ async def grab_media(
         if settings.mode == "radarr":
             try:
                 result = await radarr_client.grab_movie(request.title, request.year)
+                already_in_library = result.get("already_in_library", False)
                 return GrabResponse(
                     status="success",
-                    message=f"Successfully added '{request.title}' to Radarr with auto-search",
+                    message=(
+                        f"'{request.title}' is already in Radarr"
+                        if already_in_library else
+                        f"Successfully added '{request.title}' to Radarr with auto-search"
+                    ),
                     details={
                         "mode": "radarr",
                         "title": request.title,
                         "year": request.year,
                         "movie_id": result["radarr_result"].get("id"),
                         "tmdb_id": result["movie"].get("tmdbId"),
-                        "search_triggered": result["search_triggered"]
+                        "search_triggered": result["search_triggered"],
+                        "already_in_library": already_in_library
                     }
                 )
             except ValueError as e:
@@ -200,9 +257,14 @@ async def grab_media(
         elif settings.mode == "blackhole":
             try:
                 result = await blackhole_client.grab_via_blackhole(request.title, request.year)
+                duplicate = result["download"].get("duplicate", False)
                 return GrabResponse(
                     status="success",
-                    message=f"Successfully downloaded torrent for '{request.title}' to blackhole",
+                    message=(
+                        f"Torrent for '{request.title}' is already in the blackhole"
+                        if duplicate else
+                        f"Successfully downloaded torrent for '{request.title}' to blackhole"
+                    ),
                     details={
                         "mode": "blackhole",
                         "title": request.title,
@@ -211,7 +273,8 @@ async def grab_media(
                         "filename": result["download"]["filename"],
                         "watch_dir": result["watch_dir"],
                         "seeders": result["torrent"].get("seeders"),
-                        "size_gb": round(result["torrent"].get("size", 0) / (1024**3), 2)
+                        "size_gb": round(result["torrent"].get("size", 0) / (1024**3), 2),
+                        "duplicate": duplicate
                     }
                 )
             except ValueError as e:
@@ -243,6 +306,102 @@ async def grab_media(
         ) from e
 
 
+@app.post("/grab/bulk", response_model=BulkGrabResponse)
+async def bulk_grab_media(
+    request: BulkGrabRequest,
+    token: str = Depends(verify_token)
+):
+    """
+    Add many movies to Radarr at once.
+
+    Titles are resolved concurrently and new movies are submitted in a single
+    bulk import. Each item gets its own outcome in the response.
+    """
+    if settings.mode != "radarr":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bulk grab is only available in radarr mode"
+        )
+
+    try:
+        logger.info(f"Bulk grab request: {len(request.items)} movies")
+
+        results = await radarr_client.bulk_grab([(item.title, item.year) for item in request.items])
+
+        return BulkGrabResponse(
+            status="success",
+            total=len(results),
+            added=sum(1 for result in results if result["status"] == "added"),
+            results=results
+        )
+
+    except Exception as e:
+        logger.error(f"Error processing bulk grab request: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        ) from e
+
+
+@app.post("/acquisitions", response_model=AcquisitionResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_acquisition(
+    request: GrabRequest,
+    token: str = Depends(verify_token)
+):
+    """
+    Accept a movie for acquisition and track it in the background.
+
+    Returns a job id straight away; poll GET /acquisitions/{job_id} for the
+    outcome once Radarr has searched for a release.
+    """
+    if settings.mode != "radarr":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Acquisitions are only available in radarr mode"
+        )
+
+    job = acquisition_tracker.submit(request.title, request.year)
+    return AcquisitionResponse(
+        status="accepted",
+        message=f"Acquisition of '{request.title}' accepted",
+        job=job
+    )
+
+
+@app.get("/acquisitions/{job_id}", response_model=AcquisitionJob)
+async def get_acquisition(
+    job_id: str,
+    token: str = Depends(verify_token)
+):
+    """
+    Get the current state of an acquisition job.
+    """
+    job = acquisition_tracker.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Acquisition job not found"
+        )
+    return job
+
+
+@app.post("/scoring/reload")
+async def reload_scoring_profile(token: str = Depends(verify_token)):
+    """
+    Re-read SCORING_PROFILE and recompile the torrent ranking weights.
+    """
+    try:
+        profile = await jackett_client.reload_scoring_profile()
+        return {"status": "success", "profile": profile.model_dump()}
+
+    except ValueError as e:
+        logger.error(f"Invalid scoring profile: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid scoring profile"
+        ) from e
+
+
 @app.post("/watchlist/add", response_model=WatchlistResponse)
 async def add_to_watchlist(
     request: WatchlistRequest,
@@ -365,3 +524,21 @@ async def mark_as_watched(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update watchlist item"
         ) from e
+
+
+@app.post("/webhooks/radarr")
+async def radarr_webhook(
+    event: RadarrWebhook,
+    token: str = Depends(verify_webhook)
+):
+    """
+    Receive Radarr Grab/Download/Delete notifications.
+
+    Matching watchlist entries are updated in place, so their status follows
+    Radarr without polling it, and the Radarr library index is kept current.
+    """
+    if event.movie is not None:
+        radarr_client.apply_webhook(event.event_type, event.movie.tmdb_id, event.movie.imdb_id)
+
+    updated = await watchlist_manager.apply_radarr_event(event)
+    return {"status": "success", "event": event.event_type, "updated": updated}
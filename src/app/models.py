@@ -60,6 +60,34 @@ class GrabResponse(BaseModel):
     details: dict | None = Field(None, description="Additional response details")
 
 
+class BulkGrabRequest(BaseModel):
+    items: list[GrabRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Movies to add in one batch"
+    )
+
+
+class BulkGrabItemResult(BaseModel):
+    title: str = Field(..., description="Requested movie title")
+    year: int | None = Field(None, description="Requested movie year")
+    status: Literal["added", "exists", "not_found", "error"] = Field(
+        ...,
+        description="Outcome for this movie"
+    )
+    tmdb_id: int | None = Field(None, description="TMDB id of the matched movie")
+    movie_id: int | None = Field(None, description="Radarr movie id")
+    message: str | None = Field(None, description="Reason for a not_found or error outcome")
+
+
+class BulkGrabResponse(BaseModel):
+    status: str = Field(..., description="Success or error status")
+    total: int = Field(..., description="Number of requested movies")
+    added: int = Field(..., description="Number of movies newly added to Radarr")
+    results: list[BulkGrabItemResult] = Field(..., description="Per-movie outcomes, in request order")
+
+
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Overall health status: healthy, degraded, unhealthy")
     timestamp: float = Field(..., description="Health check timestamp")
@@ -134,10 +162,11 @@ class WatchlistItem(BaseModel):
     priority: str = Field(..., description="Priority level")
     notes: str | None = Field(None, description="Personal notes")
     added_date: str = Field(..., description="Date added to watchlist")
-    status: Literal["pending", "available", "watched"] = Field(
+    status: Literal["pending", "downloading", "available", "watched"] = Field(
         default="pending",
         description="Current status of the movie"
     )
+    tmdb_id: int | None = Field(None, description="TMDB id of the matched movie")
 
 
 class WatchlistListResponse(BaseModel):
@@ -145,3 +174,36 @@ class WatchlistListResponse(BaseModel):
     total: int = Field(..., description="Total number of items in watchlist")
     items: list[WatchlistItem] = Field(..., description="List of watchlist items")
 
+
+class RadarrWebhookMovie(BaseModel):
+    id: int | None = Field(None, description="Radarr movie id")
+    title: str | None = Field(None, description="Movie title")
+    year: int | None = Field(None, description="Movie year")
+    tmdb_id: int | None = Field(None, alias="tmdbId", description="TMDB id of the movie")
+    imdb_id: str | None = Field(None, alias="imdbId", description="IMDb id of the movie")
+
+
+class RadarrWebhook(BaseModel):
+    event_type: str = Field(..., alias="eventType", description="Radarr notification type")
+    movie: RadarrWebhookMovie | None = Field(None, description="Movie the notification is about")
+
+
+class AcquisitionJob(BaseModel):
+    id: str = Field(..., description="Unique identifier for the acquisition job")
+    title: str = Field(..., description="Requested movie title")
+    year: int | None = Field(None, description="Requested movie year")
+    status: Literal[
+        "accepted", "searching", "grabbed", "available", "no_release", "not_found", "failed"
+    ] = Field(default="accepted", description="Current state of the acquisition")
+    movie_id: int | None = Field(None, description="Radarr movie id")
+    tmdb_id: int | None = Field(None, description="TMDB id of the matched movie")
+    command_id: int | None = Field(None, description="Radarr search command being tracked")
+    message: str | None = Field(None, description="Details about the current state")
+    created_at: str = Field(..., description="When the job was accepted")
+    updated_at: str = Field(..., description="When the job last changed state")
+
+
+class AcquisitionResponse(BaseModel):
+    status: str = Field(..., description="Success or error status")
+    message: str = Field(..., description="Human readable message")
+    job: AcquisitionJob = Field(..., description="The accepted acquisition job")
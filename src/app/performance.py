@@ -3,7 +3,8 @@
 import asyncio
 import functools
 import time
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from .logging_config import get_logger
@@ -66,11 +67,27 @@ class ConnectionPool:
 
 
 class AsyncCache:
-    """Simple in-memory async cache with TTL."""
-
-    def __init__(self, default_ttl: float = 300.0):  # 5 minutes default
-        self._cache: dict[str, dict[str, Any]] = {}
+    """In-memory async cache with TTL, LRU eviction and stale-while-revalidate.
+
+    Entries past their TTL are treated as misses by ``get``. ``get_or_load``
+    can additionally serve an expired entry for up to ``stale_ttl`` seconds
+    while a single background task refreshes it.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 300.0,  # 5 minutes default
+        max_size: int = 1024,
+        stale_ttl: float = 0.0
+    ):
+        self._cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
         self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+
+    def __len__(self) -> int:
+        return len(self._cache)
 
     async def get(self, key: str) -> Any | None:
         """Get a value from cache."""
@@ -79,9 +96,11 @@ class AsyncCache:
 
         entry = self._cache[key]
         if time.time() > entry['expires']:
-            del self._cache[key]
+            if time.time() > entry['expires'] + self.stale_ttl:
+                del self._cache[key]
             return None
 
+        self._cache.move_to_end(key)
         logger.debug(
             "Cache hit",
             extra={'event': 'cache_hit', 'key': key}
@@ -95,12 +114,82 @@ class AsyncCache:
             'value': value,
             'expires': time.time() + ttl
         }
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.max_size:
+            evicted, _ = self._cache.popitem(last=False)
+            logger.debug(
+                "Cache evict",
+                extra={'event': 'cache_evict', 'key': evicted}
+            )
 
         logger.debug(
             "Cache set",
             extra={'event': 'cache_set', 'key': key, 'ttl': ttl}
         )
 
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None = None,
+        should_cache: Callable[[Any], bool] | None = None
+    ) -> Any:
+        """Return a cached value, loading it on a miss.
+
+        An expired entry still inside the stale window is returned immediately
+        and refreshed in the background. ``should_cache`` can veto caching of
+        a loaded value (e.g. empty results).
+        """
+        entry = self._cache.get(key)
+        now = time.time()
+
+        if entry is not None:
+            if now <= entry['expires']:
+                self._cache.move_to_end(key)
+                logger.debug("Cache hit", extra={'event': 'cache_hit', 'key': key})
+                return entry['value']
+
+            if now <= entry['expires'] + self.stale_ttl:
+                self._cache.move_to_end(key)
+                self._schedule_refresh(key, loader, ttl, should_cache)
+                logger.debug("Cache stale hit", extra={'event': 'cache_stale_hit', 'key': key})
+                return entry['value']
+
+            del self._cache[key]
+
+        value = await loader()
+        if should_cache is None or should_cache(value):
+            await self.set(key, value, ttl)
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float | None,
+        should_cache: Callable[[Any], bool] | None
+    ) -> None:
+        """Refresh a stale entry in the background, at most once at a time."""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                value = await loader()
+                if should_cache is None or should_cache(value):
+                    await self.set(key, value, ttl)
+                logger.debug("Cache refreshed", extra={'event': 'cache_refresh', 'key': key})
+            except Exception as e:
+                logger.warning(
+                    "Cache refresh failed, keeping stale value",
+                    extra={'event': 'cache_refresh_failed', 'key': key, 'error': str(e)}
+                )
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
     async def delete(self, key: str) -> None:
         """Delete a value from cache."""
         if key in self._cache:
@@ -116,11 +205,11 @@ class AsyncCache:
         logger.info("Cache cleared", extra={'event': 'cache_clear'})
 
     async def cleanup_expired(self) -> None:
-        """Remove expired entries from cache."""
+        """Remove entries that are past their TTL and stale window."""
         current_time = time.time()
         expired_keys = [
             key for key, entry in self._cache.items()
-            if current_time > entry['expires']
+            if current_time > entry['expires'] + self.stale_ttl
         ]
 
         for key in expired_keys:
@@ -133,6 +222,37 @@ class AsyncCache:
             )
 
 
+class SingleFlight:
+    """Coalesce concurrent identical calls into one in-flight call.
+
+    The first caller for a key starts the work; callers arriving while it
+    runs await the same task and share its result or exception. A caller
+    being cancelled does not cancel the shared work for the others.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``func`` for ``key`` unless an identical call is already running."""
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.create_task(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.debug(
+                "Joined in-flight call",
+                extra={'event': 'singleflight_join', 'key': key}
+            )
+
+        return await asyncio.shield(task)
+
+
 # Global instances
 connection_pool = ConnectionPool()
 cache = AsyncCache()
@@ -1,12 +1,67 @@
+import asyncio
+import functools
 import logging
+import re
+import time
 from typing import Any
 
 import httpx
 
 from .config import settings
+from .http_client import http_clients
+from .performance import AsyncCache, SingleFlight
 
 logger = logging.getLogger(__name__)
 
+_IMDB_ID_RE = re.compile(r"tt\d{7,}", re.IGNORECASE)
+_TMDB_ID_RE = re.compile(r"tmdb[:-](\d+)", re.IGNORECASE)
+
+
+class MovieLibrary:
+    """In-memory index of the movies in Radarr, keyed by TMDB and IMDb id"""
+
+    def __init__(self):
+        self._by_tmdb: dict[int, dict[str, Any]] = {}
+        self._by_imdb: dict[str, dict[str, Any]] = {}
+        self.synced_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._by_tmdb)
+
+    def load(self, movies: list[dict[str, Any]]) -> None:
+        """Replace the index with a full library listing"""
+        self._by_tmdb.clear()
+        self._by_imdb.clear()
+        for movie in movies:
+            self.add(movie)
+        self.synced_at = time.monotonic()
+
+    def add(self, movie: dict[str, Any]) -> None:
+        """Insert or update one movie"""
+        if movie.get("tmdbId"):
+            self._by_tmdb[movie["tmdbId"]] = movie
+        if movie.get("imdbId"):
+            self._by_imdb[movie["imdbId"]] = movie
+
+    def remove(self, tmdb_id: int | None = None, imdb_id: str | None = None) -> None:
+        """Drop a movie deleted from Radarr, found by either id"""
+        movie = self.get(tmdb_id, imdb_id)
+        if movie is None:
+            return
+        self._by_tmdb.pop(movie.get("tmdbId"), None)
+        self._by_imdb.pop(movie.get("imdbId"), None)
+
+    def get(self, tmdb_id: int | None = None, imdb_id: str | None = None) -> dict[str, Any] | None:
+        """Return the library entry for either id, if the movie is in Radarr"""
+        if tmdb_id and tmdb_id in self._by_tmdb:
+            return self._by_tmdb[tmdb_id]
+        if imdb_id:
+            return self._by_imdb.get(imdb_id)
+        return None
+
+    def is_stale(self, ttl: float) -> bool:
+        return self.synced_at is None or time.monotonic() - self.synced_at > ttl
+
 
 class RadarrClient:
     def __init__(self):
@@ -16,33 +71,100 @@ class RadarrClient:
             "X-Api-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        self._inflight = SingleFlight()
+        self.lookup_cache = AsyncCache(
+            default_ttl=settings.radarr_lookup_ttl,
+            max_size=settings.cache_max_entries
+        )
+        self.library = MovieLibrary()
+        self.library_ttl = settings.radarr_library_ttl
+        self._library_task: asyncio.Task | None = None
+        self.bulk_concurrency = max(1, settings.bulk_lookup_concurrency)
 
-    async def search_movie(self, title: str, year: int | None = None) -> list[dict[str, Any]]:
-        """Search for movies using Radarr's lookup endpoint"""
-        search_term = f"{title} {year}" if year else title
+    async def search_movie(
+        self,
+        title: str,
+        year: int | None = None,
+        tmdb_id: int | None = None,
+        imdb_id: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Search for movies using Radarr's lookup endpoints
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/api/v3/movie/lookup",
-                    headers=self.headers,
-                    params={"term": search_term}
-                )
-                response.raise_for_status()
-                results = response.json()
+        A known id, or a title that is an IMDb id ("tt1234567") or "tmdb:<id>",
+        is resolved directly instead of through a free-text search. Results
+        are cached per normalized term, and concurrent lookups for the same
+        term share one request.
+        """
+        term = title.strip()
+        if imdb_id is None and tmdb_id is None:
+            if _IMDB_ID_RE.fullmatch(term):
+                imdb_id = term.lower()
+            elif match := _TMDB_ID_RE.fullmatch(term):
+                tmdb_id = int(match.group(1))
 
-                logger.info(f"Found {len(results)} results for '{search_term}'")
-                return results
+        if tmdb_id is not None:
+            key = f"tmdb:{tmdb_id}"
+            loader = functools.partial(self._lookup_by_id, "tmdb", {"tmdbId": tmdb_id})
+        elif imdb_id is not None:
+            key = f"imdb:{imdb_id}"
+            loader = functools.partial(self._lookup_by_id, "imdb", {"imdbId": imdb_id})
+        else:
+            search_term = f"{title} {year}" if year else title
+            key = "lookup:" + " ".join(search_term.lower().split())
+            loader = functools.partial(self._lookup, search_term)
 
-            except httpx.HTTPError as e:
-                logger.error(f"Error searching Radarr: {e}")
-                raise
+        return await self.lookup_cache.get_or_load(
+            key,
+            lambda: self._inflight.do(key, loader),
+            # Empty results are not cached so a newly listed movie is found on retry
+            should_cache=bool
+        )
+
+    async def _lookup(self, search_term: str) -> list[dict[str, Any]]:
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(
+                f"{self.base_url}/api/v3/movie/lookup",
+                headers=self.headers,
+                params={"term": search_term}
+            )
+            response.raise_for_status()
+            results = response.json()
+
+            logger.info(f"Found {len(results)} results for '{search_term}'")
+            return results
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error searching Radarr: {e}")
+            raise
 
-    async def add_movie(self, movie_data: dict[str, Any]) -> dict[str, Any]:
-        """Add a movie to Radarr and trigger search"""
+    async def _lookup_by_id(self, source: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+        """Resolve a movie through /movie/lookup/tmdb or /movie/lookup/imdb"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(
+                f"{self.base_url}/api/v3/movie/lookup/{source}",
+                headers=self.headers,
+                params=params
+            )
+            if response.status_code == 404:
+                return []
+            response.raise_for_status()
+            result = response.json()
 
-        # Build the payload for adding a movie
-        payload = {
+            # These endpoints return a single movie rather than a list
+            if isinstance(result, list):
+                return result
+            return [result] if result else []
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error looking up movie by {source} id in Radarr: {e}")
+            raise
+
+    @staticmethod
+    def _movie_payload(movie_data: dict[str, Any], search: bool = True) -> dict[str, Any]:
+        """Build the payload for adding a movie"""
+        return {
             "title": movie_data["title"],
             "qualityProfileId": settings.quality_profile_id,
             "rootFolderPath": settings.root_folder,
@@ -57,53 +179,249 @@ class RadarrClient:
             "runtime": movie_data.get("runtime"),
             "overview": movie_data.get("overview"),
             "addOptions": {
-                "searchForMovie": True  # This triggers the search automatically
+                "searchForMovie": search  # This triggers the search automatically
             }
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/api/v3/movie",
-                    headers=self.headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                logger.info(f"Added movie '{movie_data['title']}' to Radarr (ID: {result.get('id')})")
-                return result
+    async def add_movie(self, movie_data: dict[str, Any], search: bool = True) -> dict[str, Any]:
+        """Add a movie to Radarr and, unless ``search`` is False, trigger search"""
+        payload = self._movie_payload(movie_data, search)
 
-            except httpx.HTTPError as e:
-                logger.error(f"Error adding movie to Radarr: {e}")
-                if hasattr(e, 'response') and e.response is not None:
-                    logger.error(f"Response content: {e.response.text}")
-                raise
+        client = http_clients.get("radarr")
+        try:
+            response = await client.post(
+                f"{self.base_url}/api/v3/movie",
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            result = response.json()
 
-    async def get_system_status(self) -> dict[str, Any]:
-        """Get Radarr system status for health checks"""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/api/v3/system/status",
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            logger.info(f"Added movie '{movie_data['title']}' to Radarr (ID: {result.get('id')})")
+            self.library.add(result)
+            return result
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error adding movie to Radarr: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response content: {e.response.text}")
+            raise
+
+    async def import_movies(self, movies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Add several movies in one request through Radarr's bulk import endpoint"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.post(
+                f"{self.base_url}/api/v3/movie/import",
+                headers=self.headers,
+                json=[self._movie_payload(movie) for movie in movies]
+            )
+            response.raise_for_status()
+            results = response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error importing movies to Radarr: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                logger.error(f"Response content: {e.response.text}")
+            raise
+
+        for result in results:
+            self.library.add(result)
+
+        logger.info(f"Imported {len(results)} movies to Radarr")
+        return results
 
+    async def bulk_grab(self, requests: list[tuple[str, int | None]]) -> list[dict[str, Any]]:
+        """Resolve many titles concurrently and add the new ones in a single import
+
+        Returns one result per requested title, in request order, with a
+        status of added, exists, not_found or error.
+        """
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def resolve(title: str, year: int | None) -> dict[str, Any] | None:
+            async with semaphore:
+                search_results = await self.search_movie(title, year)
+            return self.pick_movie(search_results, year) if search_results else None
+
+        resolved = await asyncio.gather(
+            *(resolve(title, year) for title, year in requests), return_exceptions=True
+        )
+        self.ensure_library()
+
+        results: list[dict[str, Any]] = []
+        to_import: dict[int, dict[str, Any]] = {}
+
+        for (title, year), movie in zip(requests, resolved, strict=True):
+            result = {"title": title, "year": year}
+            results.append(result)
+
+            if isinstance(movie, Exception):
+                result.update(status="error", message=str(movie))
+            elif movie is None or not movie.get("tmdbId"):
+                result.update(status="not_found", message=f"No movies found for '{title}'")
+            elif (existing := self.library.get(movie["tmdbId"], movie.get("imdbId"))) is not None:
+                result.update(status="exists", tmdb_id=movie["tmdbId"], movie_id=existing.get("id"))
+            else:
+                # The same film requested twice is imported once
+                to_import.setdefault(movie["tmdbId"], movie)
+                result.update(status="added", tmdb_id=movie["tmdbId"])
+
+        if to_import:
+            ids: dict[int, int] | None = None
+            error = ""
+            try:
+                imported = await self.import_movies(list(to_import.values()))
+                ids = {movie.get("tmdbId"): movie.get("id") for movie in imported}
             except httpx.HTTPError as e:
-                logger.error(f"Error getting Radarr status: {e}")
-                raise
+                error = str(e)
 
-    async def grab_movie(self, title: str, year: int | None = None) -> dict[str, Any]:
-        """High-level method: search for movie and add it with auto-search"""
+            for result in results:
+                if result["status"] != "added":
+                    continue
+                if ids is None:
+                    result.update(status="error", message=error)
+                elif result["tmdb_id"] in ids:
+                    result["movie_id"] = ids[result["tmdb_id"]]
+                else:
+                    result.update(status="error", message="Radarr did not import this movie")
 
-        # Search for the movie
-        search_results = await self.search_movie(title, year)
+        return results
 
-        if not search_results:
-            raise ValueError(f"No movies found for '{title}'")
+    async def sync_library(self) -> int:
+        """Load the whole Radarr library into the in-memory index"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(f"{self.base_url}/api/v3/movie", headers=self.headers)
+            response.raise_for_status()
+            movies = response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error loading Radarr library: {e}")
+            raise
+
+        self.library.load(movies)
+        logger.info(f"Indexed {len(self.library)} movies from the Radarr library")
+        return len(self.library)
+
+    def ensure_library(self) -> None:
+        """Start a background resync when the index is older than RADARR_LIBRARY_TTL
+
+        Grabs never wait for the full library fetch: they use the current
+        index, and a failed resync keeps it. Adds still go to Radarr, which
+        rejects true duplicates itself.
+        """
+        if not self.library.is_stale(self.library_ttl):
+            return
+        if self._library_task is None or self._library_task.done():
+            self._library_task = asyncio.create_task(self._resync_library())
+
+    def apply_webhook(self, event_type: str, tmdb_id: int | None, imdb_id: str | None = None) -> None:
+        """Keep the library index in step with a Radarr webhook notification
+
+        A movie deleted in Radarr leaves the index at once, so the next grab
+        adds it again instead of reporting it present until the next resync.
+        File downloads and deletions update the movie's hasFile flag.
+        """
+        if event_type == "MovieDelete":
+            self.library.remove(tmdb_id, imdb_id)
+        elif event_type in ("Download", "MovieFileDelete"):
+            movie = self.library.get(tmdb_id, imdb_id)
+            if movie is not None:
+                movie["hasFile"] = event_type == "Download"
+
+    async def _resync_library(self) -> None:
+        try:
+            await self.sync_library()
+        except httpx.HTTPError:
+            pass  # Already logged; retried when the index is next found stale
+
+    async def close(self) -> None:
+        """Cancel a background library resync still running"""
+        if self._library_task is not None and not self._library_task.done():
+            self._library_task.cancel()
+            await asyncio.gather(self._library_task, return_exceptions=True)
+
+    async def monitor_movie(self, movie: dict[str, Any]) -> None:
+        """Mark a library movie as monitored, so its searches and upgrades are acted on"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.put(
+                f"{self.base_url}/api/v3/movie/editor",
+                headers=self.headers,
+                json={"movieIds": [movie["id"]], "monitored": True}
+            )
+            response.raise_for_status()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error monitoring movie in Radarr: {e}")
+            raise
+
+        movie["monitored"] = True
+
+    async def search_existing(self, movie_id: int) -> dict[str, Any]:
+        """Trigger a search for a movie that is already in the library"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.post(
+                f"{self.base_url}/api/v3/command",
+                headers=self.headers,
+                json={"name": "MoviesSearch", "movieIds": [movie_id]}
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error triggering Radarr search: {e}")
+            raise
+
+    async def get_commands(self) -> list[dict[str, Any]]:
+        """List Radarr's recent and running commands"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(f"{self.base_url}/api/v3/command", headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error listing Radarr commands: {e}")
+            raise
+
+    async def get_queue(self) -> list[dict[str, Any]]:
+        """List the download queue in one page"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(
+                f"{self.base_url}/api/v3/queue",
+                headers=self.headers,
+                params={"page": 1, "pageSize": 1000, "includeMovie": "false"}
+            )
+            response.raise_for_status()
+            return response.json().get("records", [])
 
+        except httpx.HTTPError as e:
+            logger.error(f"Error reading Radarr queue: {e}")
+            raise
+
+    async def get_system_status(self) -> dict[str, Any]:
+        """Get Radarr system status for health checks"""
+        client = http_clients.get("radarr")
+        try:
+            response = await client.get(
+                f"{self.base_url}/api/v3/system/status",
+                headers=self.headers,
+                timeout=10.0
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting Radarr status: {e}")
+            raise
+
+    @staticmethod
+    def pick_movie(search_results: list[dict[str, Any]], year: int | None = None) -> dict[str, Any]:
+        """Pick the best lookup result, preferring an exact year match"""
         # Pick the first result (you could add more sophisticated selection logic)
         selected_movie = search_results[0]
 
@@ -117,15 +435,51 @@ class RadarrClient:
             if year_matches:
                 selected_movie = year_matches[0]
 
+        return selected_movie
+
+    async def grab_movie(self, title: str, year: int | None = None) -> dict[str, Any]:
+        """High-level method: search for movie and add it with auto-search"""
+
+        # Search for the movie
+        search_results = await self.search_movie(title, year)
+
+        if not search_results:
+            raise ValueError(f"No movies found for '{title}'")
+
+        selected_movie = self.pick_movie(search_results, year)
+
         logger.info(f"Selected movie: {selected_movie['title']} ({selected_movie.get('year')})")
 
+        # Skip the add when the movie is already in the library
+        self.ensure_library()
+        existing = self.library.get(selected_movie.get("tmdbId"), selected_movie.get("imdbId"))
+
+        if existing is not None:
+            if existing.get("hasFile"):
+                logger.info(f"'{existing['title']}' is already downloaded in Radarr")
+                search_triggered = False
+            else:
+                logger.info(f"'{existing['title']}' is already in Radarr, searching for it")
+                if not existing.get("monitored", True):
+                    await self.monitor_movie(existing)
+                await self.search_existing(existing["id"])
+                search_triggered = True
+
+            return {
+                "movie": selected_movie,
+                "radarr_result": existing,
+                "search_triggered": search_triggered,
+                "already_in_library": True
+            }
+
         # Add the movie to Radarr
         result = await self.add_movie(selected_movie)
 
         return {
             "movie": selected_movie,
             "radarr_result": result,
-            "search_triggered": True
+            "search_triggered": True,
+            "already_in_library": False
         }
 
 
@@ -0,0 +1,104 @@
+"""In-memory index of recently published releases."""
+
+import re
+import time
+from collections import OrderedDict
+
+from .dedup import fingerprint
+from .torznab import TorrentResult
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a title or release name into lower-case alphanumeric tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class RecentReleaseIndex:
+    """Inverted index of release names seen in recent indexer feeds.
+
+    Releases are keyed by their dedup fingerprint, so a release seen again
+    replaces the older record and moves to the back of the age order. The
+    index is bounded by entry count and by age since a release was last seen.
+    """
+
+    def __init__(self, max_entries: int = 5000, max_age: float = 172800.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        # fingerprint -> (torrent, tokens, seen_at), oldest first
+        self._entries: OrderedDict[str, tuple[TorrentResult, tuple[str, ...], float]] = OrderedDict()
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, torrents: list[TorrentResult]) -> int:
+        """Index a batch of releases, returning how many were new"""
+        now = time.monotonic()
+        added = 0
+
+        for torrent in torrents:
+            key = fingerprint(torrent)
+            if key in self._entries:
+                self._remove(key)
+            else:
+                added += 1
+
+            tokens = tuple(tokenize(torrent.title))
+            self._entries[key] = (torrent, tokens, now)
+            for token in set(tokens):
+                self._postings.setdefault(token, set()).add(key)
+
+        self.prune()
+        return added
+
+    def lookup(self, title: str, year: int | None = None) -> list[TorrentResult]:
+        """Return indexed releases whose name starts with the title (and year)
+
+        Candidates come from intersecting the posting sets of the query
+        tokens, smallest first, and are then checked against the token order
+        of the release name.
+        """
+        self.prune()
+
+        query = tokenize(title)
+        if year:
+            query.append(str(year))
+        if not query:
+            return []
+
+        postings = sorted((self._postings.get(token, set()) for token in set(query)), key=len)
+        if not postings[0]:
+            return []
+
+        keys = set(postings[0]).intersection(*postings[1:])
+        results = []
+        for key in keys:
+            torrent, tokens, _ = self._entries[key]
+            if list(tokens[:len(query)]) == query:
+                results.append(torrent)
+        return results
+
+    def prune(self) -> None:
+        """Drop releases past the age limit and the oldest ones beyond the size limit"""
+        cutoff = time.monotonic() - self.max_age
+
+        while self._entries:
+            key, (_, _, seen_at) = next(iter(self._entries.items()))
+            if seen_at >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._postings.clear()
+
+    def _remove(self, key: str) -> None:
+        _, tokens, _ = self._entries.pop(key)
+        for token in set(tokens):
+            keys = self._postings.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[token]
@@ -0,0 +1,126 @@
+"""Release-name classification for torrent titles."""
+
+import functools
+import re
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from .config import DEFAULT_EXCLUDE_REGEX
+from .torznab import TorrentResult
+
+# One pattern covering every token we care about; scanned once per title
+_TOKEN_RE = re.compile(
+    r"""
+    (?<![a-z0-9])
+    (?:
+        (?P<resolution>2160p|1080p|720p|576p|480p)
+      | (?P<webdl>web[-.]?dl)
+      | (?P<bluray>blu[-.]?ray)
+      | (?P<webrip>web[-.]?rip)
+      | (?P<hdtv>hdtv)
+      | (?P<dvdrip>dvd[-.]?rip)
+      | (?P<codec>x264|x265|h[.]?264|h[.]?265|hevc|avc|av1|xvid)
+      | (?P<cam>(?:hd|hq)?[-.]?cam(?:[-.]?rip)?)
+      | (?P<telesync>(?:hd|hq)?[-.]?ts(?:[-.]?rip)?|tele[-.]?sync|(?:hd)?[-.]?tc|telecine|workprint)
+    )
+    (?![a-z0-9])
+    """,
+    re.VERBOSE,
+)
+
+_GROUP_RE = re.compile(r"-([A-Za-z0-9]+)(?:\.[A-Za-z0-9]{2,4})?$")
+
+# Sources in order of preference; the best one present in a title wins
+SOURCES = ("web-dl", "bluray", "webrip", "hdtv", "dvdrip")
+_SOURCE_GROUPS = {"webdl": "web-dl", "bluray": "bluray", "webrip": "webrip",
+                  "hdtv": "hdtv", "dvdrip": "dvdrip"}
+_SOURCE_RANK = {source: rank for rank, source in enumerate(SOURCES)}
+
+
+class ReleaseInfo(NamedTuple):
+    """Attributes extracted from a release name"""
+
+    resolution: str | None
+    source: str | None
+    codec: str | None
+    group: str | None
+    cam: bool
+    telesync: bool
+    quality_match: bool
+    excluded: bool
+    tier: int | None = None  # Index of the first quality tier matched, 0 is preferred
+
+
+class ReleaseClassifier:
+    """Classify release names in a single scan, memoizing recent results.
+
+    The configured quality and exclude regexes are evaluated as part of the
+    same classification, so each distinct title is examined once no matter
+    how many indexers or searches return it. Fallback regexes form a ladder
+    of lower quality tiers below ``quality_regex``.
+
+    The default exclude regex is applied through the whole-token cam and
+    telesync flags, which also cover labels such as HDCAMRip, HQCAM, TSRip
+    and HDTC, so titles that merely contain "ts" or "tc" (Knights, Pitch)
+    are not rejected. Custom exclude regexes are searched as given.
+    """
+
+    def __init__(
+        self,
+        quality_regex: re.Pattern,
+        exclude_regex: re.Pattern,
+        cache_size: int = 4096,
+        fallback_regexes: Sequence[re.Pattern] = (),
+    ):
+        self.quality_regex = quality_regex
+        self.exclude_regex = exclude_regex
+        self.tiers = (quality_regex, *fallback_regexes)
+        self.token_exclude = exclude_regex.pattern == DEFAULT_EXCLUDE_REGEX
+        self.classify = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, title: str) -> ReleaseInfo:
+        resolution = source = codec = None
+        cam = telesync = False
+
+        for match in _TOKEN_RE.finditer(title.lower()):
+            kind = match.lastgroup
+            token = match.group(kind)
+
+            if kind == "resolution":
+                resolution = resolution or token
+            elif kind in _SOURCE_GROUPS:
+                found = _SOURCE_GROUPS[kind]
+                if source is None or _SOURCE_RANK[found] < _SOURCE_RANK[source]:
+                    source = found
+            elif kind == "codec":
+                codec = codec or token.replace(".", "")
+            elif kind == "cam":
+                cam = True
+            elif kind == "telesync":
+                telesync = True
+
+        if self.token_exclude:
+            excluded = cam or telesync
+        else:
+            excluded = self.exclude_regex.search(title) is not None
+
+        group_match = _GROUP_RE.search(title)
+        tier = next((i for i, regex in enumerate(self.tiers) if regex.search(title)), None)
+
+        return ReleaseInfo(
+            resolution=resolution,
+            source=source,
+            codec=codec,
+            group=group_match.group(1) if group_match else None,
+            cam=cam,
+            telesync=telesync,
+            quality_match=tier is not None,
+            excluded=excluded,
+            tier=tier,
+        )
+
+    def classify_torrent(self, torrent: TorrentResult) -> ReleaseInfo:
+        """Classify a torrent's title, storing the result on the record"""
+        if torrent.release is None:
+            torrent.release = self.classify(torrent.title)
+        return torrent.release
@@ -0,0 +1,140 @@
+"""Scoring and ranking of torrent candidates.
+
+Scoring profiles are compiled once into a per-item function, and the best
+candidates are kept in a bounded heap as results arrive.
+"""
+
+import heapq
+from collections.abc import Callable, Iterable
+
+from .config import ScoringProfile
+from .torznab import TorrentResult
+
+DEFAULT_PROFILE = ScoringProfile()
+
+# Upper bound of the default profile: seeders + source + size + freeleech
+MAX_SCORE = DEFAULT_PROFILE.max_score()
+
+
+class CompiledProfile:
+    """A scoring profile bound into a single per-item scoring function.
+
+    Every weight is captured once in a closure, so scoring a torrent never
+    looks up the profile at runtime, and terms with zero weight are skipped
+    by one flag test each. ``terms`` names the terms kept, in the order they
+    are summed. Torrents must be classified before scoring.
+    """
+
+    def __init__(self, profile: ScoringProfile):
+        self.profile = profile
+        self.max_score = profile.max_score()
+        self.terms = self._term_names(profile)
+        self.score = self._bind(profile)
+
+    @staticmethod
+    def _term_names(p: ScoringProfile) -> tuple[str, ...]:
+        weights = (
+            ("seeders", p.seeders_weight), ("peers", p.peers_weight), ("grabs", p.grabs_weight),
+            ("source", p.source_bonus), ("size", p.size_bonus),
+            ("freeleech", p.freeleech_bonus), ("upload", p.upload_bonus),
+        )
+        return tuple(name for name, weight in weights if weight)
+
+    @staticmethod
+    def _bind(p: ScoringProfile) -> Callable[[TorrentResult], float]:
+        seeders_weight, seeders_cap = p.seeders_weight, p.seeders_cap
+        peers_weight, peers_cap = p.peers_weight, p.peers_cap
+        grabs_weight, grabs_cap = p.grabs_weight, p.grabs_cap
+        source_bonus = dict(p.source_bonus)
+        size_target, size_bonus, size_penalty = p.size_target_gb, p.size_bonus, p.size_penalty_per_gb
+        freeleech_bonus, upload_bonus = p.freeleech_bonus, p.upload_bonus
+
+        def score(t: TorrentResult) -> float:
+            total = 0.0
+            if seeders_weight:
+                total += min(t.seeders * seeders_weight, seeders_cap)
+            if peers_weight:
+                total += min(t.peers * peers_weight, peers_cap)
+            if grabs_weight:
+                total += min(t.grabs * grabs_weight, grabs_cap)
+            if source_bonus:
+                total += source_bonus.get(t.release.source, 0.0)
+            if size_bonus:
+                total += max(0.0, size_bonus - abs(t.size_gb - size_target) * size_penalty)
+            if freeleech_bonus and t.download_volume_factor == 0.0:
+                total += freeleech_bonus
+            if upload_bonus and t.upload_volume_factor > 1.0:
+                total += upload_bonus
+            return total
+
+        return score
+
+
+def rank_key(torrent: TorrentResult) -> tuple[int, float]:
+    """Sort key for candidates: better quality tier first, then higher score"""
+    tier = torrent.release.tier if torrent.release is not None else None
+    return (-(tier or 0), torrent.score)
+
+
+class TopKSelector:
+    """Keep the K best-ranked candidates seen so far in a bounded min-heap.
+
+    Candidates rank by quality tier, then score. Ties keep the earlier
+    candidate, matching a stable descending sort. Once every slot holds a
+    top-tier candidate at ``max_score`` nothing that follows can displace it,
+    and ``settled`` turns true so callers can stop reading.
+    """
+
+    def __init__(self, k: int, max_score: float = MAX_SCORE):
+        self.k = max(1, k)
+        self.max_key = (0, max_score)
+        self._heap: list[tuple[tuple[int, float], int, TorrentResult]] = []
+        self._seen = 0
+
+    def offer(self, torrent: TorrentResult) -> bool:
+        """Consider a scored torrent, returning True if it entered the top K"""
+        # Later arrivals rank lower on equal rank, hence the negated sequence
+        entry = (rank_key(torrent), -self._seen, torrent)
+        self._seen += 1
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+
+        return False
+
+    def offer_all(self, torrents: Iterable[TorrentResult]) -> list[TorrentResult]:
+        """Offer a batch of torrents, returning the ones that entered the top K"""
+        return [torrent for torrent in torrents if self.offer(torrent)]
+
+    def update(self, torrents: Iterable[TorrentResult]) -> None:
+        """Re-rank torrents whose score went up after they were first offered"""
+        held = {id(entry[2]) for entry in self._heap}
+        rescored = False
+        retry = []
+
+        for torrent in torrents:
+            if id(torrent) in held:
+                rescored = True
+            else:
+                retry.append(torrent)
+
+        # Scores only rise, so held entries stay selected; restore heap order
+        if rescored:
+            self._heap = [(rank_key(entry[2]), entry[1], entry[2]) for entry in self._heap]
+            heapq.heapify(self._heap)
+
+        self.offer_all(retry)
+
+    @property
+    def settled(self) -> bool:
+        """True when no further candidate could change the selection"""
+        return len(self._heap) == self.k and self._heap[0][0] >= self.max_key
+
+    def ranked(self) -> list[TorrentResult]:
+        """Return the selected candidates, best first"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
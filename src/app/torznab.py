@@ -0,0 +1,288 @@
+"""Incremental Torznab feed parsing."""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Any
+
+TORZNAB_NS = "{http://torznab.com/schemas/2015/feed}"
+
+GIB = 1024 * 1024 * 1024
+
+# Hex-encoded v1 infohash inside a magnet URI
+_BTIH_RE = re.compile(r"xt=urn:btih:([0-9a-fA-F]{40})")
+
+
+class TorrentResult:
+    """Compact record for a single Torznab search result.
+
+    Derived fields used by filtering and scoring (lower-cased title, size in
+    GB) are computed once here. Use ``to_dict`` to get the API shape.
+    """
+
+    __slots__ = (
+        "title",
+        "link",
+        "guid",
+        "pub_date",
+        "description",
+        "size",
+        "seeders",
+        "peers",
+        "grabs",
+        "download_volume_factor",
+        "upload_volume_factor",
+        "download_url",
+        "infohash",
+        "title_lower",
+        "size_gb",
+        "score",
+        "release",
+    )
+
+    def __init__(
+        self,
+        title: str = "",
+        link: str = "",
+        guid: str = "",
+        pub_date: str = "",
+        description: str = "",
+        size: int = 0,
+        seeders: int = 0,
+        peers: int = 0,
+        grabs: int = 0,
+        download_volume_factor: float = 1.0,
+        upload_volume_factor: float = 1.0,
+        download_url: str | None = None,
+        infohash: str = "",
+    ):
+        self.title = title
+        self.link = link
+        self.guid = guid
+        self.pub_date = pub_date
+        self.description = description
+        self.size = size
+        self.seeders = seeders
+        self.peers = peers
+        self.grabs = grabs
+        self.download_volume_factor = download_volume_factor
+        self.upload_volume_factor = upload_volume_factor
+        self.download_url = download_url if download_url is not None else link
+        self.infohash = infohash.lower()
+        self.title_lower = title.lower()
+        self.size_gb = size / GIB
+        self.score = 0.0
+        self.release = None  # ReleaseInfo, filled in on first classification
+
+    def __repr__(self) -> str:
+        return f"TorrentResult(title={self.title!r}, seeders={self.seeders}, size_gb={self.size_gb:.2f})"
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TorrentResult":
+        """Build a record from the dictionary shape returned by the API"""
+        return cls(
+            title=data.get("title", ""),
+            link=data.get("link", ""),
+            guid=data.get("guid", ""),
+            pub_date=data.get("pubDate", ""),
+            description=data.get("description", ""),
+            size=data.get("size", 0),
+            seeders=data.get("seeders", 0),
+            peers=data.get("peers", 0),
+            grabs=data.get("grabs", 0),
+            download_volume_factor=data.get("downloadvolumefactor", 1.0),
+            upload_volume_factor=data.get("uploadvolumefactor", 1.0),
+            download_url=data.get("download_url"),
+            infohash=data.get("infohash", ""),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to the dictionary shape exposed in API responses"""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "guid": self.guid,
+            "pubDate": self.pub_date,
+            "description": self.description,
+            "size": self.size,
+            "seeders": self.seeders,
+            "peers": self.peers,
+            "grabs": self.grabs,
+            "downloadvolumefactor": self.download_volume_factor,
+            "uploadvolumefactor": self.upload_volume_factor,
+            "download_url": self.download_url,
+            "infohash": self.infohash,
+            "score": self.score,
+        }
+
+
+def _get_text(element: ET.Element | None) -> str:
+    """Safely get text from XML element"""
+    return element.text if element is not None and element.text is not None else ""
+
+
+def _to_int(value: str | None) -> int:
+    return int(value) if value else 0
+
+
+def _to_float(value: str | None) -> float:
+    return float(value) if value else 1.0
+
+
+def parse_item(item: ET.Element) -> TorrentResult:
+    """Convert a single RSS <item> element into a TorrentResult"""
+    size = seeders = peers = grabs = 0
+    download_factor = upload_factor = 1.0
+    infohash = ""
+
+    # Parse torznab attributes
+    for attr in item.iter(f"{TORZNAB_NS}attr"):
+        name = attr.get("name")
+        value = attr.get("value")
+
+        if name == "size":
+            size = _to_int(value)
+        elif name == "seeders":
+            seeders = _to_int(value)
+        elif name == "peers":
+            peers = _to_int(value)
+        elif name == "grabs":
+            grabs = _to_int(value)
+        elif name == "downloadvolumefactor":
+            download_factor = _to_float(value)
+        elif name == "uploadvolumefactor":
+            upload_factor = _to_float(value)
+        elif name == "infohash":
+            infohash = value or ""
+        elif name == "magneturl" and not infohash:
+            match = _BTIH_RE.search(value or "")
+            infohash = match.group(1) if match else ""
+
+    # Extract download URL from enclosure or link
+    link = _get_text(item.find("link"))
+    enclosure = item.find("enclosure")
+    download_url = enclosure.get("url") if enclosure is not None else link
+
+    return TorrentResult(
+        title=_get_text(item.find("title")),
+        link=link,
+        guid=_get_text(item.find("guid")),
+        pub_date=_get_text(item.find("pubDate")),
+        description=_get_text(item.find("description")),
+        size=size,
+        seeders=seeders,
+        peers=peers,
+        grabs=grabs,
+        download_volume_factor=download_factor,
+        upload_volume_factor=upload_factor,
+        download_url=download_url,
+        infohash=infohash,
+    )
+
+
+class TorznabStreamParser:
+    """Parse a Torznab RSS feed incrementally from raw byte chunks.
+
+    Each <item> is converted as soon as its closing tag has been read and is
+    then detached from the tree, so memory use does not grow with feed size.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._channel: ET.Element | None = None
+
+    def feed(self, chunk: bytes) -> list[TorrentResult]:
+        """Feed a chunk of the response body and return completed items"""
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> list[TorrentResult]:
+        """Signal end of input and return any remaining items"""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[TorrentResult]:
+        items = []
+
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if element.tag == "channel":
+                    self._channel = element
+                continue
+
+            if element.tag != "item":
+                continue
+
+            items.append(parse_item(element))
+
+            # Drop the parsed item so the tree never holds more than one
+            element.clear()
+            if self._channel is not None:
+                try:
+                    self._channel.remove(element)
+                except ValueError:
+                    pass
+
+        return items
+
+
+def parse_feed(content: str | bytes) -> list[TorrentResult]:
+    """Parse a complete Torznab feed. Raises ET.ParseError on malformed XML."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    parser = TorznabStreamParser()
+    results = parser.feed(content)
+    results.extend(parser.close())
+    return results
+
+
+class IndexerCapabilities:
+    """Search modes and categories an indexer advertises through t=caps"""
+
+    __slots__ = ("search_available", "search_params", "movie_available", "movie_params", "categories")
+
+    def __init__(
+        self,
+        search_available: bool = True,
+        search_params: frozenset[str] = frozenset({"q"}),
+        movie_available: bool = False,
+        movie_params: frozenset[str] = frozenset(),
+        categories: frozenset[str] = frozenset(),
+    ):
+        self.search_available = search_available
+        self.search_params = search_params
+        self.movie_available = movie_available
+        self.movie_params = movie_params
+        self.categories = categories
+
+    def supports_movie_param(self, param: str) -> bool:
+        return self.movie_available and param in self.movie_params
+
+
+def _parse_mode(element: ET.Element | None) -> tuple[bool, frozenset[str]]:
+    if element is None or element.get("available", "no").lower() != "yes":
+        return False, frozenset()
+    params = element.get("supportedParams", "q")
+    return True, frozenset(p.strip().lower() for p in params.split(",") if p.strip())
+
+
+def parse_caps(content: str | bytes) -> IndexerCapabilities:
+    """Parse a Torznab t=caps document. Raises ET.ParseError on malformed XML."""
+    root = ET.fromstring(content)
+
+    search_available, search_params = _parse_mode(root.find("searching/search"))
+    movie_available, movie_params = _parse_mode(root.find("searching/movie-search"))
+
+    categories = set()
+    for category in root.iter("category"):
+        categories.add(category.get("id", ""))
+        categories.update(subcat.get("id", "") for subcat in category.iter("subcat"))
+    categories.discard("")
+
+    return IndexerCapabilities(
+        search_available=search_available,
+        search_params=search_params,
+        movie_available=movie_available,
+        movie_params=movie_params,
+        categories=frozenset(categories),
+    )
@@ -11,19 +11,28 @@ from datetime import datetime
 from typing import Dict, List, Optional
 
 from .logging_config import get_logger
-from .models import WatchlistItem, WatchlistRequest
+from .models import RadarrWebhook, WatchlistItem, WatchlistRequest
 from .radarr import radarr_client
 from .blackhole import blackhole_client
 from .config import settings
 
 logger = get_logger(__name__)
 
+# Radarr notification -> watchlist status; statuses listed in ``keep`` are left alone
+_WEBHOOK_STATUS = {
+    "Grab": ("downloading", {"available", "watched"}),
+    "Download": ("available", {"watched"}),
+    "MovieFileDelete": ("pending", {"watched"}),
+    "MovieDelete": ("pending", {"watched"}),
+}
+
 
 class WatchlistManager:
     """Manages a personal movie watchlist with automatic acquisition."""
 
     def __init__(self):
         self._watchlist: Dict[str, WatchlistItem] = {}
+        self._by_tmdb: dict[int, set[str]] = {}
         self._lock = asyncio.Lock()
 
     async def add_to_watchlist(self, request: WatchlistRequest) -> tuple[str, bool]:
@@ -62,9 +71,8 @@ class WatchlistManager:
             # Trigger background acquisition
             acquisition_success = await self._trigger_acquisition(watchlist_item)
 
-            # Update status based on acquisition result
+            # Status then follows Radarr's webhook notifications
             if acquisition_success:
-                watchlist_item.status = "available"
                 logger.info(
                     f"Movie acquisition successful: {request.title}",
                     extra={
@@ -96,9 +104,13 @@ class WatchlistManager:
         try:
             if settings.mode == "radarr":
                 result = await radarr_client.grab_movie(item.title, item.year)
+                self._index(item, result["movie"].get("tmdbId"))
+                if result["radarr_result"].get("hasFile"):
+                    item.status = "available"
                 return True
             elif settings.mode == "blackhole":
                 result = await blackhole_client.grab_via_blackhole(item.title, item.year)
+                item.status = "available"
                 return True
             else:
                 logger.error(f"Unknown mode: {settings.mode}")
@@ -138,6 +150,7 @@ class WatchlistManager:
         async with self._lock:
             if watchlist_id in self._watchlist:
                 item = self._watchlist.pop(watchlist_id)
+                self._unindex(item)
                 logger.info(
                     f"Removed from watchlist: {item.title}",
                     extra={
@@ -165,17 +178,71 @@ class WatchlistManager:
                 return True
             return False
 
+    async def apply_radarr_event(self, event: RadarrWebhook) -> int:
+        """
+        Update watchlist entries from a Radarr webhook notification.
+
+        Entries are found through the tmdbId index, so each notification
+        costs one dictionary lookup regardless of watchlist size.
+
+        Returns:
+            int: number of entries whose status changed
+        """
+        mapping = _WEBHOOK_STATUS.get(event.event_type)
+        if mapping is None or event.movie is None or event.movie.tmdb_id is None:
+            return 0
+
+        new_status, keep = mapping
+        updated = 0
+
+        async with self._lock:
+            for watchlist_id in self._by_tmdb.get(event.movie.tmdb_id, ()):
+                item = self._watchlist[watchlist_id]
+                if item.status in keep or item.status == new_status:
+                    continue
+
+                item.status = new_status
+                updated += 1
+                logger.info(
+                    f"Radarr {event.event_type} for {item.title}: {new_status}",
+                    extra={
+                        'event': 'watchlist_radarr_update',
+                        'watchlist_id': watchlist_id,
+                        'title': item.title,
+                        'radarr_event': event.event_type,
+                        'status': new_status
+                    }
+                )
+
+        return updated
+
+    def _index(self, item: WatchlistItem, tmdb_id: int | None) -> None:
+        """Record the item under its TMDB id for webhook lookups."""
+        if tmdb_id is None:
+            return
+        item.tmdb_id = tmdb_id
+        self._by_tmdb.setdefault(tmdb_id, set()).add(item.id)
+
+    def _unindex(self, item: WatchlistItem) -> None:
+        ids = self._by_tmdb.get(item.tmdb_id)
+        if ids is not None:
+            ids.discard(item.id)
+            if not ids:
+                del self._by_tmdb[item.tmdb_id]
+
     async def get_stats(self) -> dict:
         """Get watchlist statistics."""
         async with self._lock:
             total = len(self._watchlist)
             pending = sum(1 for item in self._watchlist.values() if item.status == "pending")
+            downloading = sum(1 for item in self._watchlist.values() if item.status == "downloading")
             available = sum(1 for item in self._watchlist.values() if item.status == "available")
             watched = sum(1 for item in self._watchlist.values() if item.status == "watched")
 
             return {
                 "total": total,
                 "pending": pending,
+                "downloading": downloading,
                 "available": available,
                 "watched": watched
             }
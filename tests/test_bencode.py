@@ -0,0 +1,53 @@
+import hashlib
+
+import pytest
+
+from src.app.bencode import BencodeError, is_torrent, parse_torrent
+
+INFO = b"d6:lengthi1024e4:name9:test.file12:piece lengthi32768e6:pieces20:" + b"\x00" * 20 + b"e"
+TORRENT = b"d8:announce18:http://tracker/ann4:info" + INFO + b"e"
+
+
+def test_infohash_is_sha1_of_info_span():
+    meta = parse_torrent(TORRENT)
+
+    start, end = meta.info_span
+    assert TORRENT[start:end] == INFO
+    assert meta.infohash == hashlib.sha1(INFO).hexdigest()
+    assert meta.name == "test.file"
+    assert meta.announce == "http://tracker/ann"
+
+
+def test_accepts_memoryview_and_bytearray():
+    expected = parse_torrent(TORRENT)
+    assert parse_torrent(memoryview(TORRENT)) == expected
+    assert parse_torrent(bytearray(TORRENT)) == expected
+
+
+def test_trackerless_torrent_is_valid():
+    meta = parse_torrent(b"d4:info" + INFO + b"e")
+    assert meta.announce is None
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not a torrent file",
+    b"d8:announce4:info4:infoe",  # substrings present, no info dictionary
+    b"d4:info" + INFO + b"e" + b"junk",  # trailing data
+    b"d4:info" + INFO,  # truncated
+    b"d4:infod4:name1:xee",  # no piece length
+    b"d4:infod4:name1:x12:piece lengthi01eee",  # leading zero
+    b"d4:infod4:name1:x12:piece lengthi-0eee",  # negative zero
+    b"d4:info" + INFO[:-1] + b"99:shorte" + b"e",  # string past end
+    b"l" * 100 + b"e" * 100,  # not a dictionary
+])
+def test_rejects_invalid_data(data):
+    with pytest.raises(BencodeError):
+        parse_torrent(data)
+    assert not is_torrent(data)
+
+
+def test_rejects_deep_nesting():
+    nested = b"l" * 100 + b"e" * 100
+    with pytest.raises(BencodeError, match="too deep"):
+        parse_torrent(b"d4:info" + INFO + b"5:extra" + nested + b"e")
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.app.http_client import HTTPClientManager
+
+
+@pytest.fixture
+def manager():
+    with patch('src.app.http_client.settings') as mock_settings:
+        mock_settings.max_concurrent_requests = 4
+        mock_settings.http_keepalive_expiry = 30.0
+        mock_settings.request_timeout = 30.0
+        mock_settings.http2_enabled = False
+        yield HTTPClientManager()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused_per_upstream(manager):
+    """Each upstream gets one long-lived client"""
+    await manager.startup()
+
+    radarr = manager.get("radarr")
+    assert manager.get("radarr") is radarr
+    assert manager.get("jackett") is not radarr
+
+    await manager.close()
+    assert radarr.is_closed
+
+
+@pytest.mark.asyncio
+async def test_client_recreated_after_close(manager):
+    """A closed pool is replaced lazily on next use"""
+    client = manager.get("downloads")
+    await manager.close()
+
+    replacement = manager.get("downloads")
+    assert replacement is not client
+    assert not replacement.is_closed
+    await manager.close()
+
+
+def test_unknown_upstream(manager):
+    with pytest.raises(KeyError):
+        manager.get("sonarr")
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_without_h2(manager):
+    """HTTP/2 is optional and degrades to HTTP/1.1 when h2 is missing"""
+    with patch('src.app.http_client.settings.http2_enabled', True), \
+         patch('src.app.http_client._http2_available', return_value=False):
+        client = manager.get("jackett")
+
+    assert not client.is_closed
+    await manager.close()
@@ -1,9 +1,30 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import hashlib
+import re
+import time
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
-from src.app.blackhole import BlackholeClient
+from src.app.blackhole import BlackholeClient, WatchDirIndex
+from src.app.config import ScoringProfile
+from src.app.dedup import Deduplicator, dedupe
 from src.app.jackett import JackettClient
+from src.app.recent import RecentReleaseIndex
+from src.app.release import ReleaseClassifier
+from src.app.scoring import MAX_SCORE, CompiledProfile, TopKSelector
+from src.app.torznab import (
+    IndexerCapabilities,
+    TorrentResult,
+    TorznabStreamParser,
+    parse_caps,
+)
+
+INFO_A = b"d4:name1:a12:piece lengthi16384e6:pieces0:e"
+INFO_B = b"d4:name1:b12:piece lengthi16384e6:pieces0:e"
+TORRENT_A = b"d4:info" + INFO_A + b"e"
+TORRENT_B = b"d4:info" + INFO_B + b"e"
 
 
 class TestJackettClient:
@@ -17,8 +38,23 @@ class TestJackettClient:
             mock_settings.min_seeders = 20
             mock_settings.quality_regex = r"1080p.*WEB-DL|1080p.*BluRay"
             mock_settings.exclude_regex = r"CAM|TS|TC|WORKPRINT"
+            mock_settings.quality_fallbacks = []
             mock_settings.min_size_gb = 2.5
             mock_settings.max_size_gb = 6.0
+            mock_settings.jackett_search_mode = "aggregate"
+            mock_settings.search_time_budget = 8.0
+            mock_settings.search_min_candidates = 1
+            mock_settings.cache_ttl = 300.0
+            mock_settings.release_cache_size = 128
+            mock_settings.candidate_limit = 5
+            mock_settings.cache_max_entries = 16
+            mock_settings.cache_stale_ttl = 60.0
+            mock_settings.jackett_id_search = False
+            mock_settings.caps_ttl = 3600.0
+            mock_settings.recent_poll_interval = 0
+            mock_settings.recent_index_max_entries = 100
+            mock_settings.recent_index_max_age = 3600.0
+            mock_settings.scoring_profile = ScoringProfile()
             return JackettClient()
 
     @pytest.mark.asyncio
@@ -39,19 +75,283 @@ class TestJackettClient:
             </channel>
         </rss>'''
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.text = mock_xml
-            mock_response.raise_for_status.return_value = None
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=mock_xml.encode()))
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
 
             results = await jackett_client.search_torrents("Test Movie 2023")
 
             assert len(results) == 1
-            assert results[0]["title"] == "Movie.2023.1080p.WEB-DL.x264"
-            assert results[0]["seeders"] == 50
-            assert results[0]["size"] == 4294967296
+            assert results[0].title == "Movie.2023.1080p.WEB-DL.x264"
+            assert results[0].seeders == 50
+            assert results[0].size == 4294967296
+            assert results[0].download_url == "http://test.com/download/123"
+
+    @pytest.mark.asyncio
+    async def test_search_fanout_merges_indexers(self, jackett_client):
+        """Fan-out mode queries each indexer and merges the results"""
+        jackett_client.search_mode = "fanout"
+
+        async def fake_search(indexer, params, evaluate=None, done=None):
+            return [TorrentResult(title=f"Movie.2023.1080p.WEB-DL-{indexer}", seeders=50,
+                                  size=4 * 1024 ** 3)]
+
+        with patch.object(jackett_client, 'list_indexers', AsyncMock(return_value=["a", "b"])), \
+             patch.object(jackett_client, 'get_capabilities', AsyncMock(return_value=None)), \
+             patch.object(jackett_client, '_search_indexer', side_effect=fake_search) as mock_search:
+
+            results = await jackett_client.search_torrents("Movie 2023")
+
+            assert {r.title for r in results} == {
+                "Movie.2023.1080p.WEB-DL-a", "Movie.2023.1080p.WEB-DL-b"
+            }
+            assert mock_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_fanout_drops_slow_indexer_after_budget(self, jackett_client):
+        """A slow indexer is cancelled once the budget passes with enough candidates"""
+        jackett_client.search_mode = "fanout"
+        jackett_client.search_time_budget = 0.05
+
+        async def fake_search(indexer, params, evaluate=None, done=None):
+            if indexer == "slow":
+                await asyncio.sleep(10)
+            return [TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)]
+
+        with patch.object(jackett_client, 'list_indexers', AsyncMock(return_value=["fast", "slow"])), \
+             patch.object(jackett_client, 'get_capabilities', AsyncMock(return_value=None)), \
+             patch.object(jackett_client, '_search_indexer', side_effect=fake_search):
+
+            results = await asyncio.wait_for(jackett_client.search_torrents("Movie 2023"), 2)
+
+            assert len(results) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_fanout_waits_without_candidates(self, jackett_client):
+        """The budget does not cut the search short before anything usable arrives"""
+        jackett_client.search_mode = "fanout"
+        jackett_client.search_time_budget = 0.01
+
+        async def fake_search(indexer, params, evaluate=None, done=None):
+            if indexer == "slow":
+                await asyncio.sleep(0.05)
+                return [TorrentResult(title="Movie.2023.1080p.BluRay", seeders=50, size=4 * 1024 ** 3)]
+            return [TorrentResult(title="Movie.2023.CAM", seeders=50, size=4 * 1024 ** 3)]
+
+        with patch.object(jackett_client, 'list_indexers', AsyncMock(return_value=["fast", "slow"])), \
+             patch.object(jackett_client, 'get_capabilities', AsyncMock(return_value=None)), \
+             patch.object(jackett_client, '_search_indexer', side_effect=fake_search):
+
+            results = await jackett_client.search_torrents("Movie 2023")
+
+            assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_streams_and_evaluates_per_chunk(self, jackett_client):
+        """Items are parsed from the byte stream and filtered as each chunk arrives"""
+        items = "".join(
+            f'''<item><title>Movie.2023.{quality}</title><link>http://t/{i}</link>
+            <torznab:attr name="seeders" value="50"/>
+            <torznab:attr name="size" value="{4 * 1024 ** 3}"/></item>'''
+            for i, quality in enumerate(["1080p.WEB-DL", "CAM", "1080p.BluRay"] * 50)
+        )
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<rss version="2.0" xmlns:torznab="http://torznab.com/schemas/2015/feed">'
+            f'<channel>{items}</channel></rss>'
+        ).encode()
+
+        async def stream():
+            for start in range(0, len(body), 37):  # split tags across chunks
+                yield body[start:start + 37]
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=stream()))
+        batch_sizes = []
+
+        def evaluate(batch):
+            batch_sizes.append(len(batch))
+            return jackett_client._select(batch)
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            results = await jackett_client.search_torrents("Movie 2023", evaluate=evaluate)
+
+        assert sum(batch_sizes) == 150
+        assert max(batch_sizes) < 150
+        assert len(results) == 100
+        assert all(torrent.score > 0 for torrent in results)
+
+    def test_parse_torznab_response_invalid_xml(self, jackett_client):
+        assert jackett_client._parse_torznab_response("<rss><channel><item>") == []
+
+    def test_stream_parser_detaches_items(self):
+        """Parsed items are removed from the tree as the feed is consumed"""
+        parser = TorznabStreamParser()
+        parser.feed(b'<rss><channel><title>feed</title>')
+        parsed = parser.feed(b'<item><title>A</title></item><item><title>B</title></item>')
+
+        assert [item.title for item in parsed] == ["A", "B"]
+        assert len(parser._channel.findall("item")) == 0
+
+        parsed = parser.feed(b'<item><title>C</title></item></channel></rss>')
+        parsed += parser.close()
+        assert [item.title for item in parsed] == ["C"]
+
+    @pytest.mark.asyncio
+    async def test_select_torrents_keeps_top_k(self, jackett_client):
+        """Only the best K candidates are kept, in ranked order"""
+        items = "".join(
+            f'''<item><title>Movie.2023.1080p.WEB-DL.{i}</title>
+            <torznab:attr name="seeders" value="{20 + i}"/>
+            <torznab:attr name="size" value="{4 * 1024 ** 3}"/></item>'''
+            for i in range(40)
+        )
+        body = (
+            '<rss xmlns:torznab="http://torznab.com/schemas/2015/feed">'
+            f'<channel>{items}</channel></rss>'
+        ).encode()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            ranked = await jackett_client.select_torrents("Movie 2023", limit=3)
+
+        assert [t.seeders for t in ranked] == [59, 58, 57]
+
+    @pytest.mark.asyncio
+    async def test_select_torrents_merges_duplicates_across_batches(self, jackett_client):
+        """A later copy of a release upgrades the kept record instead of taking a slot"""
+        item = (
+            '<item><title>Movie.2023.1080p.WEB-DL-{tag}</title>'
+            '<torznab:attr name="seeders" value="{seeders}"/>'
+            f'<torznab:attr name="size" value="{4 * 1024 ** 3}"/>'
+            '<torznab:attr name="infohash" value="{infohash}"/></item>'
+        )
+        items = "".join([
+            item.format(tag="A", seeders=30, infohash="AA" * 20),
+            item.format(tag="B", seeders=40, infohash="bb" * 20),
+            item.format(tag="A", seeders=90, infohash="aa" * 20),
+        ])
+        body = (
+            '<rss xmlns:torznab="http://torznab.com/schemas/2015/feed">'
+            f'<channel>{items}</channel></rss>'
+        ).encode()
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            ranked = await jackett_client.select_torrents("Movie 2023", limit=2)
+
+        assert [(t.title, t.seeders) for t in ranked] == [
+            ("Movie.2023.1080p.WEB-DL-A", 90), ("Movie.2023.1080p.WEB-DL-B", 40)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_select_torrents_stops_when_settled(self, jackett_client):
+        """Reading stops once the leader has the maximum possible score"""
+        perfect = (
+            '<item><title>Movie.2023.1080p.WEB-DL</title>'
+            '<torznab:attr name="seeders" value="500"/>'
+            f'<torznab:attr name="size" value="{4 * 1024 ** 3}"/>'
+            '<torznab:attr name="downloadvolumefactor" value="0"/></item>'
+        )
+        chunks_sent = []
+
+        async def stream():
+            yield b'<rss xmlns:torznab="http://torznab.com/schemas/2015/feed"><channel>'
+            for i in range(100):
+                chunks_sent.append(i)
+                yield perfect.encode()
+            yield b'</channel></rss>'
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=stream()))
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            ranked = await jackett_client.select_torrents("Movie 2023", limit=1)
+
+        assert len(ranked) == 1
+        assert len(chunks_sent) < 100
+
+    @pytest.mark.asyncio
+    async def test_select_torrents_is_cached_per_normalized_query(self, jackett_client):
+        """Repeat searches are answered from the cache"""
+        best = TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)
+
+        with patch.object(jackett_client, '_select_uncached', AsyncMock(return_value=[best])) as mock_select:
+            first = await jackett_client.select_torrents("Movie 2023")
+            second = await jackett_client.select_torrents("  movie   2023 ")
+
+        assert first == second == [best]
+        mock_select.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_selects_share_one_search(self, jackett_client):
+        """Identical concurrent searches are coalesced into one upstream call"""
+        release = asyncio.Event()
+        best = TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)
+
+        async def slow_select(query, limit, imdb_id=None):
+            await release.wait()
+            return [best]
+
+        with patch.object(jackett_client, '_select_uncached', side_effect=slow_select) as mock_select:
+            waiters = [
+                asyncio.create_task(jackett_client.select_torrents("Movie 2023"))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+
+            assert await asyncio.gather(*waiters) == [[best]] * 3
+            mock_select.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_select_torrents_does_not_cache_empty(self, jackett_client):
+        with patch.object(jackett_client, '_select_uncached', AsyncMock(return_value=[])) as mock_select:
+            await jackett_client.select_torrents("Movie 2023")
+            await jackett_client.select_torrents("Movie 2023")
+
+        assert mock_select.call_count == 2
+
+    def test_top_k_selector_matches_stable_sort(self):
+        """Ties keep the earlier candidate, like a stable descending sort"""
+        torrents = []
+        for i, score in enumerate([5.0, 9.0, 5.0, 9.0, 1.0, 7.0]):
+            torrent = TorrentResult(title=str(i))
+            torrent.score = score
+            torrents.append(torrent)
+
+        selector = TopKSelector(3)
+        selector.offer_all(torrents)
+
+        expected = sorted(torrents, key=lambda t: t.score, reverse=True)[:3]
+        assert selector.ranked() == expected
+        assert not selector.settled
+
+    def test_torrent_result_round_trip(self):
+        """Records convert to and from the API dictionary shape"""
+        data = {
+            "title": "Movie.2023.1080p.WEB-DL.x264",
+            "link": "http://test.com/123",
+            "seeders": 50,
+            "size": 2 * 1024 ** 3,
+            "downloadvolumefactor": 0.0,
+        }
+
+        torrent = TorrentResult.from_dict(data)
+
+        assert torrent.title_lower == "movie.2023.1080p.web-dl.x264"
+        assert torrent.size_gb == 2.0
+        assert torrent.download_url == "http://test.com/123"
+        assert not hasattr(torrent, "__dict__")
+        assert torrent.to_dict()["downloadvolumefactor"] == 0.0
+        assert torrent.to_dict()["seeders"] == 50
 
     def test_filter_torrents(self, jackett_client):
         """Test torrent filtering logic"""
@@ -79,29 +379,29 @@ class TestJackettClient:
             }
         ]
 
-        filtered = jackett_client.filter_torrents(torrents)
+        filtered = jackett_client.filter_torrents([TorrentResult.from_dict(t) for t in torrents])
 
         # Should only have the first and last torrents
         assert len(filtered) == 2
-        assert "WEB-DL" in filtered[0]["title"] or "BluRay" in filtered[0]["title"]
-        assert all(t["seeders"] >= 20 for t in filtered)
+        assert "WEB-DL" in filtered[0].title or "BluRay" in filtered[0].title
+        assert all(t.seeders >= 20 for t in filtered)
 
     def test_calculate_score(self, jackett_client):
         """Test torrent scoring algorithm"""
 
-        web_dl_torrent = {
-            "title": "Movie.2023.1080p.WEB-DL.x264",
-            "seeders": 50,
-            "size": 4 * 1024 * 1024 * 1024,  # 4GB (optimal size)
-            "downloadvolumefactor": 0.0,  # Freeleech
-        }
+        web_dl_torrent = TorrentResult(
+            title="Movie.2023.1080p.WEB-DL.x264",
+            seeders=50,
+            size=4 * 1024 * 1024 * 1024,  # 4GB (optimal size)
+            download_volume_factor=0.0,  # Freeleech
+        )
 
-        bluray_torrent = {
-            "title": "Movie.2023.1080p.BluRay.x264",
-            "seeders": 30,
-            "size": 6 * 1024 * 1024 * 1024,  # 6GB
-            "downloadvolumefactor": 1.0,
-        }
+        bluray_torrent = TorrentResult(
+            title="Movie.2023.1080p.BluRay.x264",
+            seeders=30,
+            size=6 * 1024 * 1024 * 1024,  # 6GB
+            download_volume_factor=1.0,
+        )
 
         web_dl_score = jackett_client._calculate_score(web_dl_torrent)
         bluray_score = jackett_client._calculate_score(bluray_torrent)
@@ -113,44 +413,423 @@ class TestJackettClient:
     async def test_get_best_torrent_success(self, jackett_client):
         """Test getting the best torrent for a movie"""
 
-        mock_torrents = [
-            {
-                "title": "Movie.2023.1080p.WEB-DL.x264",
-                "seeders": 50,
-                "size": 4 * 1024 * 1024 * 1024,
-                "download_url": "http://test.com/download/123"
-            }
-        ]
+        # Search returns already filtered and scored torrents
+        best = TorrentResult(
+            title="Movie.2023.1080p.WEB-DL.x264",
+            seeders=50,
+            size=4 * 1024 * 1024 * 1024,
+            download_url="http://test.com/download/123",
+        )
+        best.score = 25.0
+        mock_torrents_with_score = [best]
 
-        # Add score to mock torrents
-        mock_torrents_with_score = [
-            {
-                "title": "Movie.2023.1080p.WEB-DL.x264",
-                "seeders": 50,
-                "size": 4 * 1024 * 1024 * 1024,
-                "download_url": "http://test.com/download/123",
-                "score": 25.0
-            }
-        ]
+        with patch.object(jackett_client, 'select_torrents', return_value=mock_torrents_with_score) as mock_select:
+
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+            assert result is not None
+            assert result.title == "Movie.2023.1080p.WEB-DL.x264"
+            mock_select.assert_called_once_with("Movie 2023")
+
+    @pytest.mark.asyncio
+    async def test_get_best_torrent_answers_from_recent_index(self, jackett_client):
+        """A release seen in the recent feed is returned without a live search"""
+        jackett_client.recent_index.add([
+            TorrentResult(title="Movie.2023.1080p.WEB-DL.x264-GRP", seeders=50, size=4 * 1024 ** 3),
+            TorrentResult(title="Movie.2023.HDCAM-GRP", seeders=90, size=4 * 1024 ** 3),
+        ])
+
+        with patch.object(jackett_client, 'select_torrents', AsyncMock()) as mock_select:
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+        assert result.title == "Movie.2023.1080p.WEB-DL.x264-GRP"
+        mock_select.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_recent_fallback_tier_match_still_searches_live(self, jackett_client):
+        """Only a preferred-tier recent match skips the live search"""
+        jackett_client.classifier = ReleaseClassifier(
+            jackett_client.quality_regex,
+            jackett_client.exclude_regex,
+            fallback_regexes=[re.compile(r"720p")],
+        )
+        jackett_client.recent_index.add([
+            TorrentResult(title="Movie.2023.720p.WEB-DL.x264-GRP", seeders=50, size=4 * 1024 ** 3),
+        ])
+        live = TorrentResult(title="Movie.2023.1080p.WEB-DL.x264-GRP", seeders=30, size=4 * 1024 ** 3)
+
+        with patch.object(jackett_client, 'select_torrents', AsyncMock(return_value=[live])) as mock_select:
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+        assert result is live
+        mock_select.assert_called_once_with("Movie 2023")
+
+        # With nothing live, the recent fallback-tier match is still used
+        with patch.object(jackett_client, 'select_torrents', AsyncMock(return_value=[])):
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+        assert result.title == "Movie.2023.720p.WEB-DL.x264-GRP"
+
+    @pytest.mark.asyncio
+    async def test_refresh_recent_indexes_feed(self, jackett_client):
+        requests = []
+        body = (
+            b'<rss xmlns:torznab="http://torznab.com/schemas/2015/feed"><channel>'
+            b'<item><title>Movie.2023.1080p.WEB-DL</title></item></channel></rss>'
+        )
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=body)
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+            assert await jackett_client.refresh_recent() == 1
+            assert await jackett_client.refresh_recent() == 0
+
+        assert "q" not in requests[0].url.params
+        assert len(jackett_client.recent_index) == 1
+
+    @pytest.mark.asyncio
+    async def test_recent_poll_survives_unexpected_errors(self, jackett_client):
+        """Errors other than HTTP ones are logged and polling carries on"""
+        jackett_client.recent_poll_interval = 0.001
+        polled = asyncio.Event()
+        refresh = AsyncMock(side_effect=[httpx.ConnectError("down"), ValueError("invalid literal for int()"), 1])
+
+        async def fake_refresh():
+            result = await refresh()
+            if refresh.await_count == 3:
+                polled.set()
+            return result
+
+        with patch.object(jackett_client, 'refresh_recent', side_effect=fake_refresh):
+            jackett_client.start_recent_poll()
+            await asyncio.wait_for(polled.wait(), 1)
+            assert not jackett_client._recent_task.done()
+            await jackett_client.stop_recent_poll()
+
+    @pytest.mark.asyncio
+    async def test_get_best_torrent_searches_by_imdb_id(self, jackett_client):
+        """With a resolvable IMDb id the search uses t=movie instead of free text"""
+        jackett_client.id_search = True
+        best = TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)
+
+        with patch.object(jackett_client, 'resolve_imdb_id', AsyncMock(return_value="tt1234567")), \
+             patch.object(jackett_client, 'select_torrents', AsyncMock(return_value=[best])) as mock_select:
+
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+            assert result is best
+            mock_select.assert_called_once_with("Movie 2023", imdb_id="tt1234567")
+
+    @pytest.mark.asyncio
+    async def test_get_best_torrent_falls_back_to_text_search(self, jackett_client):
+        jackett_client.id_search = True
+        best = TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)
+
+        with patch.object(jackett_client, 'resolve_imdb_id', AsyncMock(return_value="tt1234567")), \
+             patch.object(jackett_client, 'select_torrents', AsyncMock(side_effect=[[], [best]])) as mock_select:
+
+            result = await jackett_client.get_best_torrent("Movie", 2023)
+
+            assert result is best
+            assert mock_select.call_args_list[1].args == ("Movie 2023",)
+
+    @pytest.mark.asyncio
+    async def test_id_search_sends_torznab_movie_query(self, jackett_client):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=b"<rss><channel></channel></rss>")
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+            await jackett_client.search_torrents("Movie 2023", imdb_id="tt1234567")
+
+        params = requests[0].url.params
+        assert params["t"] == "movie"
+        assert params["imdbid"] == "tt1234567"
+        assert "q" not in params
 
-        with patch.object(jackett_client, 'search_torrents', return_value=mock_torrents):
-            with patch.object(jackett_client, 'filter_torrents', return_value=mock_torrents_with_score):
+    def test_parse_caps(self):
+        caps = parse_caps(b"""<?xml version="1.0" encoding="UTF-8"?>
+        <caps>
+            <searching>
+                <search available="yes" supportedParams="q"/>
+                <movie-search available="yes" supportedParams="q,imdbid"/>
+                <tv-search available="no" supportedParams="q"/>
+            </searching>
+            <categories>
+                <category id="2000" name="Movies">
+                    <subcat id="2040" name="Movies/HD"/>
+                </category>
+            </categories>
+        </caps>""")
 
-                result = await jackett_client.get_best_torrent("Movie", 2023)
+        assert caps.search_available
+        assert caps.supports_movie_param("imdbid")
+        assert not caps.supports_movie_param("tmdbid")
+        assert caps.categories == {"2000", "2040"}
 
-                assert result is not None
-                assert result["title"] == "Movie.2023.1080p.WEB-DL.x264"
+    def test_params_for_indexer_follows_caps(self, jackett_client):
+        id_params = {"apikey": "k", "t": "movie", "imdbid": "tt1234567", "cat": "2000,2010"}
+
+        # Unknown capabilities: send the request as built
+        assert jackett_client._params_for_indexer(None, "Movie 2023", id_params) is id_params
+
+        # No ID search: fall back to text, keeping only categories the indexer has
+        text_only = IndexerCapabilities(categories=frozenset({"2000"}))
+        params = jackett_client._params_for_indexer(text_only, "Movie 2023", id_params)
+        assert params["t"] == "search"
+        assert params["q"] == "Movie 2023"
+        assert params["cat"] == "2000"
+        assert "imdbid" not in params
+
+        # Movie-only indexer gets text searches as t=movie
+        movie_only = IndexerCapabilities(
+            search_available=False, movie_available=True, movie_params=frozenset({"q"})
+        )
+        text_params = {"apikey": "k", "t": "search", "q": "Movie 2023", "cat": "2000"}
+        assert jackett_client._params_for_indexer(movie_only, "Movie 2023", text_params)["t"] == "movie"
+
+        # No overlapping categories: skip the indexer entirely
+        tv_only = IndexerCapabilities(categories=frozenset({"5000"}))
+        assert jackett_client._params_for_indexer(tv_only, "Movie 2023", text_params) is None
+
+    @pytest.mark.asyncio
+    async def test_capabilities_are_cached_per_indexer(self, jackett_client):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=b"<caps><searching>"
+                                  b"<search available='yes' supportedParams='q'/></searching></caps>")
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+            first = await jackett_client.get_capabilities("idx")
+            second = await jackett_client.get_capabilities("idx")
+
+        assert first is second
+        assert len(requests) == 1
+        assert requests[0].url.path == "/api/v2.0/indexers/idx/results/torznab"
+        assert requests[0].url.params["t"] == "caps"
+
+    @pytest.mark.asyncio
+    async def test_capabilities_failure_is_not_cached(self, jackett_client):
+        transport = httpx.MockTransport(lambda request: httpx.Response(500))
+
+        with patch('src.app.jackett.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            assert await jackett_client.get_capabilities("idx") is None
+
+        assert len(jackett_client.caps_cache) == 0
 
     @pytest.mark.asyncio
     async def test_get_best_torrent_no_results(self, jackett_client):
         """Test behavior when no torrents are found"""
 
-        with patch.object(jackett_client, 'search_torrents', return_value=[]):
+        with patch.object(jackett_client, 'select_torrents', return_value=[]):
 
             result = await jackett_client.get_best_torrent("Nonexistent Movie", 2023)
 
             assert result is None
 
+    def test_quality_ladder_prefers_best_tier(self, jackett_client):
+        """Lower tiers are only used when no better tier is in the same result set"""
+        jackett_client.classifier = ReleaseClassifier(
+            re.compile(r"1080p.*WEB-DL", re.IGNORECASE),
+            jackett_client.exclude_regex,
+            fallback_regexes=[re.compile(r"1080p.*BluRay", re.IGNORECASE), re.compile(r"720p")],
+        )
+        size = 4 * 1024 ** 3
+
+        def build():
+            return [
+                TorrentResult(title="Movie.2023.720p.WEB-DL", seeders=500, size=size,
+                              download_volume_factor=0.0),
+                TorrentResult(title="Movie.2023.1080p.BluRay", seeders=30, size=size),
+                TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=20, size=size),
+                TorrentResult(title="Movie.2023.480p.DVDRip", seeders=90, size=size),
+            ]
+
+        ranked = jackett_client.filter_torrents(build())
+        assert [t.title for t in ranked] == [
+            "Movie.2023.1080p.WEB-DL", "Movie.2023.1080p.BluRay", "Movie.2023.720p.WEB-DL"
+        ]
+        assert [t.release.tier for t in ranked] == [0, 1, 2]
+
+        selector = TopKSelector(2)
+        selector.offer_all(jackett_client._select(build()))
+        assert [t.title for t in selector.ranked()] == [
+            "Movie.2023.1080p.WEB-DL", "Movie.2023.1080p.BluRay"
+        ]
+
+    def test_compiled_profile_matches_legacy_weights(self, jackett_client):
+        """The default profile reproduces the original hardcoded weights"""
+        torrent = TorrentResult(title="Movie.2023.1080p.BluRay.x264", seeders=30,
+                                size=5 * 1024 ** 3, download_volume_factor=0.0)
+
+        assert jackett_client._calculate_score(torrent) == pytest.approx(3.0 + 8 + 4.0 + 15)
+        assert jackett_client.scoring.max_score == MAX_SCORE == 40.0
+
+    def test_compiled_profile_optional_terms(self):
+        profile = ScoringProfile(
+            seeders_weight=0.0, source_bonus={}, size_bonus=0.0, freeleech_bonus=0.0,
+            peers_weight=1.0, peers_cap=3.0, grabs_weight=0.5, grabs_cap=10.0, upload_bonus=2.0,
+        )
+        compiled = CompiledProfile(profile)
+        torrent = TorrentResult(title="x", seeders=500, peers=7, grabs=4, upload_volume_factor=2.0)
+
+        assert compiled.terms == ("peers", "grabs", "upload")
+        assert compiled.score(torrent) == 3.0 + 2.0 + 2.0
+        assert compiled.max_score == 15.0
+
+    @pytest.mark.asyncio
+    async def test_reload_scoring_profile(self, jackett_client):
+        await jackett_client.search_cache.set("key", ["stale"])
+        torrent = TorrentResult(title="Movie.2023.1080p.WEB-DL", seeders=50, size=4 * 1024 ** 3)
+
+        await jackett_client.reload_scoring_profile(ScoringProfile(freeleech_bonus=0.0, size_bonus=0.0))
+
+        assert jackett_client._calculate_score(torrent) == 15.0
+        assert len(jackett_client.search_cache) == 0
+
+
+class TestReleaseClassifier:
+
+    @pytest.fixture
+    def classifier(self):
+        return ReleaseClassifier(
+            re.compile(r"1080p.*WEB-DL|1080p.*BluRay", re.IGNORECASE),
+            re.compile(r"CAM|TS|TC|WORKPRINT", re.IGNORECASE),
+            cache_size=16,
+        )
+
+    def test_classify_release_name(self, classifier):
+        info = classifier.classify("Movie.2023.1080p.WEB-DL.DDP5.1.H.264-GROUP")
+
+        assert info.resolution == "1080p"
+        assert info.source == "web-dl"
+        assert info.codec == "h264"
+        assert info.group == "GROUP"
+        assert info.quality_match
+        assert not info.excluded
+        assert not info.cam and not info.telesync
+
+    def test_classify_prefers_best_source(self, classifier):
+        """WEB-DL outranks other sources appearing in the same title"""
+        assert classifier.classify("Movie.2023.720p.BluRay.WEBRip.WEB-DL").source == "web-dl"
+        assert classifier.classify("Movie.2023.1080p.Blu-Ray.x265").source == "bluray"
+
+    def test_cam_and_telesync_flags_are_whole_tokens(self, classifier):
+        assert classifier.classify("Movie.2023.HDCAM.x264").cam
+        assert classifier.classify("Movie.2023.TS.x264").telesync
+        assert not classifier.classify("Knights.2023.1080p.WEB-DL").telesync
+
+    def test_default_exclusions_match_whole_tokens(self, classifier):
+        assert classifier.classify("Movie.2023.HDCAM.x264").excluded
+        assert classifier.classify("Movie.2023.TS.x264").excluded
+        assert not classifier.classify("Knights.2023.1080p.WEB-DL").excluded
+        assert not classifier.classify("Pitch.Black.2000.1080p.BluRay").excluded
+
+    @pytest.mark.parametrize("label", ["TSRip", "HDTSRip", "HD-TS", "HDTC", "HDCAMRip", "HQCAM", "CAM-Rip",
+                                       "TeleSync", "Telecine", "WORKPRINT"])
+    def test_default_exclusions_cover_cam_and_telesync_variants(self, classifier, label):
+        assert classifier.classify(f"Movie.2023.1080p.{label}.x264-GRP").excluded
+
+    def test_custom_exclude_regex_is_searched_as_given(self):
+        classifier = ReleaseClassifier(
+            re.compile(r"1080p", re.IGNORECASE),
+            re.compile(r"HDR|TS", re.IGNORECASE),
+        )
+
+        assert classifier.classify("Movie.2023.1080p.HDR.WEB-DL").excluded
+        assert classifier.classify("Knights.2023.1080p.WEB-DL").excluded
+
+    def test_classification_is_memoized(self, classifier):
+        first = classifier.classify("Movie.2023.1080p.WEB-DL")
+        assert classifier.classify("Movie.2023.1080p.WEB-DL") is first
+        assert classifier.classify.cache_info().hits == 1
+
+
+class TestDeduplicator:
+
+    def test_duplicates_keep_best_seeders_and_freeleech(self):
+        first = TorrentResult(title="Movie.2023.1080p.WEB-DL", size=100, seeders=10, infohash="ab" * 20)
+        copy = TorrentResult(title="Movie 2023 1080p WEB-DL", size=100, seeders=50,
+                             download_volume_factor=0.0, infohash="AB" * 20)
+        other = TorrentResult(title="Movie.2023.1080p.BluRay", size=100, seeders=5)
+
+        assert dedupe([first, copy, other]) == [first, other]
+        assert first.seeders == 50
+        assert first.download_volume_factor == 0.0
+
+    def test_fingerprint_without_infohash_uses_size_and_title(self):
+        dedup = Deduplicator()
+        fresh, improved = dedup.add([
+            TorrentResult(title="Movie.2023.1080p.WEB-DL", size=100, seeders=10),
+            TorrentResult(title="movie 2023 1080p web-dl", size=100, seeders=5),
+            TorrentResult(title="Movie.2023.1080p.WEB-DL", size=200, seeders=5),
+        ])
+        assert len(fresh) == 2
+        assert improved == []
+
+        later, improved = dedup.add([TorrentResult(title="Movie_2023_1080p_WEB-DL", size=100, seeders=20)])
+        assert later == []
+        assert improved == [fresh[0]] and fresh[0].seeders == 20
+
+    def test_infohash_parsed_from_magnet(self):
+        infohash = "0123456789abcdef" * 2 + "01234567"
+        body = (
+            '<rss xmlns:torznab="http://torznab.com/schemas/2015/feed"><channel><item>'
+            '<title>Movie</title>'
+            f'<torznab:attr name="magneturl" value="magnet:?xt=urn:btih:{infohash.upper()}&amp;dn=x"/>'
+            '</item></channel></rss>'
+        ).encode()
+        parser = TorznabStreamParser()
+        items = parser.feed(body) + parser.close()
+        assert items[0].infohash == infohash
+
+
+class TestRecentReleaseIndex:
+
+    def test_lookup_matches_title_prefix_and_year(self):
+        index = RecentReleaseIndex()
+        index.add([
+            TorrentResult(title="Alien.1979.1080p.BluRay", size=1),
+            TorrentResult(title="Aliens.1986.1080p.BluRay", size=2),
+            TorrentResult(title="Alien.Romulus.2024.1080p.WEB-DL", size=3),
+            TorrentResult(title="Not.Alien.1979.1080p.BluRay", size=4),
+        ])
+
+        assert [t.title for t in index.lookup("Alien", 1979)] == ["Alien.1979.1080p.BluRay"]
+        assert [t.title for t in index.lookup("Alien: Romulus")] == ["Alien.Romulus.2024.1080p.WEB-DL"]
+        assert index.lookup("Predator", 1987) == []
+
+    def test_bounded_by_count_and_age(self):
+        index = RecentReleaseIndex(max_entries=2, max_age=3600.0)
+        index.add([TorrentResult(title=f"Movie.{i}.2023", size=i) for i in range(3)])
+
+        assert len(index) == 2
+        assert index.lookup("Movie 0") == []
+
+        with patch('src.app.recent.time.monotonic', return_value=time.monotonic() + 7200):
+            assert index.lookup("Movie 2") == []
+            assert len(index) == 0
+
+    def test_seen_again_replaces_record(self):
+        index = RecentReleaseIndex()
+        assert index.add([TorrentResult(title="Movie.2023", size=1, seeders=5)]) == 1
+        assert index.add([TorrentResult(title="Movie.2023", size=1, seeders=40)]) == 0
+        assert [t.seeders for t in index.lookup("Movie", 2023)] == [40]
+
 
 class TestBlackholeClient:
 
@@ -158,6 +837,11 @@ class TestBlackholeClient:
     def blackhole_client(self):
         with patch('src.app.blackhole.settings') as mock_settings:
             mock_settings.autoadd_watch_dir = "/tmp/test-blackhole"
+            mock_settings.grab_max_attempts = 3
+            mock_settings.grab_time_budget = 30.0
+            mock_settings.grab_attempt_timeout = 10.0
+            mock_settings.grab_race_count = 0
+            mock_settings.max_torrent_file_mb = 10.0
             return BlackholeClient()
 
     def test_generate_filename(self, blackhole_client):
@@ -181,43 +865,77 @@ class TestBlackholeClient:
         invalid_content = b'not a torrent file'
         assert not blackhole_client._is_valid_torrent(invalid_content)
 
+        # Marker substrings alone are not enough
+        assert not blackhole_client._is_valid_torrent(b'd8:announce4:infoe garbage')
+
     @pytest.mark.asyncio
-    async def test_download_torrent(self, blackhole_client):
+    async def test_download_torrent(self, blackhole_client, tmp_path):
         """Test downloading and saving torrent file"""
+        blackhole_client.watch_dir = tmp_path / "watch"
 
-        torrent_data = {
-            "title": "Test Movie 2023 1080p WEB-DL",
-            "download_url": "http://test.com/download/123.torrent"
-        }
+        torrent_data = TorrentResult(
+            title="Test Movie 2023 1080p WEB-DL",
+            download_url="http://test.com/download/123.torrent"
+        )
 
         mock_torrent_content = b'd8:announce9:test:test4:infod4:name9:test.file12:piece lengthi32768e6:pieces0:ee'
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=mock_torrent_content))
+
+        with patch('src.app.blackhole.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            result = await blackhole_client.download_torrent(torrent_data)
+
+        assert result["filename"].endswith(".torrent")
+        assert result["size"] == len(mock_torrent_content)
+        assert "Test Movie" in result["filename"]
 
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.content = mock_torrent_content
-            mock_response.raise_for_status.return_value = None
+        # Only the final file is left behind, no temp files
+        assert [p.name for p in blackhole_client.watch_dir.iterdir()] == [result["filename"]]
+        assert (blackhole_client.watch_dir / result["filename"]).read_bytes() == mock_torrent_content
 
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+    @pytest.mark.asyncio
+    async def test_download_torrent_enforces_size_cap(self, blackhole_client, tmp_path):
+        """Oversized downloads are aborted while streaming and nothing is written"""
+        blackhole_client.watch_dir = tmp_path
+        blackhole_client.max_torrent_bytes = 64
+
+        async def body():
+            for _ in range(100):
+                yield b"d" * 16
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body()))
+
+        with patch('src.app.blackhole.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
 
-            with patch('pathlib.Path.mkdir'):
-                with patch('builtins.open', create=True):
+            with pytest.raises(ValueError, match="exceeds"):
+                await blackhole_client.download_torrent(
+                    TorrentResult(title="Big", download_url="http://test.com/big.torrent")
+                )
 
-                    result = await blackhole_client.download_torrent(torrent_data)
+        assert list(tmp_path.iterdir()) == []
 
-                    assert result["filename"].endswith(".torrent")
-                    assert result["size"] == len(mock_torrent_content)
-                    assert "Test Movie" in result["filename"]
+    @pytest.mark.asyncio
+    async def test_failed_write_leaves_no_partial_file(self, blackhole_client, tmp_path):
+        blackhole_client.watch_dir = tmp_path
+
+        with patch('src.app.blackhole.os.replace', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                await blackhole_client._save_torrent(TorrentResult(title="Movie"), b"d4:infodee")
+
+        assert list(tmp_path.iterdir()) == []
 
     @pytest.mark.asyncio
     async def test_grab_via_blackhole(self, blackhole_client):
         """Test complete blackhole workflow"""
 
-        mock_torrent = {
-            "title": "Test Movie 2023 1080p WEB-DL",
-            "download_url": "http://test.com/download/123.torrent",
-            "seeders": 50,
-            "size": 4 * 1024 * 1024 * 1024
-        }
+        mock_torrent = TorrentResult(
+            title="Test Movie 2023 1080p WEB-DL",
+            download_url="http://test.com/download/123.torrent",
+            seeders=50,
+            size=4 * 1024 * 1024 * 1024
+        )
 
         mock_download_result = {
             "filename": "test_movie.torrent",
@@ -226,14 +944,216 @@ class TestBlackholeClient:
         }
 
         with patch('src.app.jackett.jackett_client') as mock_jackett:
-            mock_jackett.get_best_torrent = AsyncMock(return_value=mock_torrent)
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=[mock_torrent])
 
-            with patch.object(blackhole_client, 'download_torrent', return_value=mock_download_result):
+            with patch.object(blackhole_client, '_fetch_torrent', AsyncMock(return_value=TORRENT_A)), \
+                 patch.object(blackhole_client, '_save_torrent', return_value=mock_download_result):
 
                 result = await blackhole_client.grab_via_blackhole("Test Movie", 2023)
 
                 assert result["method"] == "blackhole"
                 assert result["title"] == "Test Movie"
                 assert result["year"] == 2023
-                assert result["torrent"] == mock_torrent
+                assert result["torrent"] == mock_torrent.to_dict()
                 assert result["download"] == mock_download_result
+                assert result["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_grab_retries_next_candidate(self, blackhole_client):
+        """A failed download moves on to the next-best candidate without searching again"""
+        candidates = [
+            TorrentResult(title=f"Movie.2023.1080p.WEB-DL-{i}", download_url=f"http://test.com/{i}")
+            for i in range(3)
+        ]
+        download_result = {"filename": "movie.torrent", "path": "/tmp/movie.torrent", "size": 1}
+
+        with patch('src.app.jackett.jackett_client') as mock_jackett:
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=candidates)
+
+            with patch.object(blackhole_client, '_fetch_torrent', AsyncMock(side_effect=[
+                httpx.ConnectError("tracker down"),
+                ValueError("Downloaded file is not a valid torrent"),
+                TORRENT_A,
+            ])) as mock_download, \
+                 patch.object(blackhole_client, '_save_torrent', return_value=download_result):
+                result = await blackhole_client.grab_via_blackhole("Movie", 2023)
+
+        assert result["torrent"]["title"] == "Movie.2023.1080p.WEB-DL-2"
+        assert result["attempts"] == 3
+        assert mock_download.call_count == 3
+        mock_jackett.get_ranked_torrents.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_grab_stops_at_attempt_limit(self, blackhole_client):
+        blackhole_client.grab_max_attempts = 2
+        candidates = [TorrentResult(title=str(i), download_url=f"http://test.com/{i}") for i in range(5)]
+
+        with patch('src.app.jackett.jackett_client') as mock_jackett:
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=candidates)
+
+            with patch.object(blackhole_client, '_fetch_torrent',
+                              AsyncMock(side_effect=httpx.ConnectError("down"))) as mock_download:
+                with pytest.raises(httpx.ConnectError):
+                    await blackhole_client.grab_via_blackhole("Movie", 2023)
+
+        assert mock_download.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hanging_candidate_leaves_time_for_the_next(self, blackhole_client):
+        """A download that never finishes is cut off and the next-best candidate is tried"""
+        blackhole_client.grab_time_budget = 0.5
+        blackhole_client.grab_attempt_timeout = 0.05
+        candidates = [TorrentResult(title=name, download_url=f"http://test.com/{name}")
+                      for name in ("hanging", "good")]
+        saved = {"filename": "good.torrent", "path": "/tmp/good.torrent", "size": 1}
+
+        async def fake_fetch(torrent):
+            if torrent.title == "hanging":
+                await asyncio.sleep(10)
+            return TORRENT_A
+
+        with patch('src.app.jackett.jackett_client') as mock_jackett:
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=candidates)
+
+            with patch.object(blackhole_client, '_fetch_torrent', side_effect=fake_fetch), \
+                 patch.object(blackhole_client, '_save_torrent', return_value=saved) as mock_save:
+                result = await asyncio.wait_for(blackhole_client.grab_via_blackhole("Movie", 2023), 2)
+
+        assert result["torrent"]["title"] == "good"
+        assert result["attempts"] == 2
+        mock_save.assert_called_once_with(candidates[1], TORRENT_A)
+
+    @pytest.mark.asyncio
+    async def test_race_keeps_first_valid_download(self, blackhole_client):
+        """Racing saves only the first valid file and cancels slower downloads"""
+        blackhole_client.race_count = 3
+        candidates = [TorrentResult(title=name, download_url=f"http://test.com/{name}")
+                      for name in ("slow", "invalid", "fast")]
+        cancelled = asyncio.Event()
+
+        async def fake_fetch(torrent):
+            if torrent.title == "slow":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            if torrent.title == "invalid":
+                raise ValueError("Downloaded file is not a valid torrent")
+            await asyncio.sleep(0.01)
+            return b"d4:infod4:name4:testee"
+
+        saved = {"filename": "fast.torrent", "path": "/tmp/fast.torrent", "size": 1}
+
+        with patch('src.app.jackett.jackett_client') as mock_jackett:
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=candidates)
+
+            with patch.object(blackhole_client, '_fetch_torrent', side_effect=fake_fetch), \
+                 patch.object(blackhole_client, '_save_torrent', return_value=saved) as mock_save:
+                result = await asyncio.wait_for(blackhole_client.grab_via_blackhole("Movie", 2023), 2)
+
+        assert result["torrent"]["title"] == "fast"
+        mock_save.assert_called_once_with(candidates[2], b"d4:infod4:name4:testee")
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_race_save_is_not_cut_by_time_budget(self, blackhole_client):
+        """The time budget bounds the downloads, not the save of the winner"""
+        blackhole_client.race_count = 2
+        blackhole_client.grab_time_budget = 0.05
+        candidates = [TorrentResult(title=name, download_url=f"http://test.com/{name}")
+                      for name in ("a", "b")]
+        saved = {"filename": "a.torrent", "path": "/tmp/a.torrent", "size": 1}
+
+        async def slow_save(torrent, content):
+            await asyncio.sleep(0.1)
+            return saved
+
+        with patch('src.app.jackett.jackett_client') as mock_jackett:
+            mock_jackett.get_ranked_torrents = AsyncMock(return_value=candidates)
+
+            with patch.object(blackhole_client, '_fetch_torrent', AsyncMock(return_value=TORRENT_A)), \
+                 patch.object(blackhole_client, '_save_torrent', side_effect=slow_save):
+                result = await blackhole_client.grab_via_blackhole("Movie", 2023)
+
+        assert result["download"] is saved
+
+    def test_watch_dir_index_tracks_pending_and_added(self, tmp_path):
+        (tmp_path / "a.torrent").write_bytes(TORRENT_A)
+        (tmp_path / "b.torrent.added").write_bytes(TORRENT_B)
+        (tmp_path / "broken.torrent").write_bytes(b"not a torrent")
+        index = WatchDirIndex(tmp_path)
+
+        assert index.refresh() == 2
+        assert index.get(hashlib.sha1(INFO_A).hexdigest()) == "a.torrent"
+        assert index.get(hashlib.sha1(INFO_B).hexdigest()) == "b.torrent.added"
+
+        # Only new files are parsed, unchanged unreadable ones are not retried,
+        # and removed ones drop out
+        (tmp_path / "b.torrent.added").unlink()
+        with patch('src.app.blackhole.parse_torrent') as mock_parse:
+            assert index.refresh() == 0
+        mock_parse.assert_not_called()
+        assert index.get(hashlib.sha1(INFO_B).hexdigest()) is None
+        assert len(index) == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_with_known_infohash_is_not_downloaded(self, blackhole_client, tmp_path):
+        blackhole_client.watch_dir = tmp_path
+        blackhole_client.index.add(hashlib.sha1(INFO_A).hexdigest(), "existing.torrent")
+        torrent = TorrentResult(title="Movie", download_url="http://test.com/a",
+                                infohash=hashlib.sha1(INFO_A).hexdigest())
+
+        with patch('src.app.blackhole.http_clients') as mock_clients:
+            result = await blackhole_client.download_torrent(torrent)
+
+        assert result["duplicate"] and result["filename"] == "existing.torrent"
+        mock_clients.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_grab_refreshes_index_with_outside_changes(self, blackhole_client, tmp_path):
+        """Files added, renamed or deleted by other tools are seen by the next grab"""
+        blackhole_client.watch_dir = tmp_path
+        blackhole_client.index = WatchDirIndex(tmp_path)
+        await blackhole_client.startup()
+        torrent = TorrentResult(title="Movie", download_url="http://test.com/a",
+                                infohash=hashlib.sha1(INFO_A).hexdigest())
+
+        async def grab():
+            with patch('src.app.jackett.jackett_client') as mock_jackett, \
+                 patch.object(blackhole_client, '_fetch_torrent', AsyncMock(return_value=TORRENT_A)) as mock_fetch:
+                mock_jackett.get_ranked_torrents = AsyncMock(return_value=[torrent])
+                result = await blackhole_client.grab_via_blackhole("Movie", 2023)
+            return result["download"], mock_fetch
+
+        (tmp_path / "other.torrent").write_bytes(TORRENT_A)
+        download, mock_fetch = await grab()
+        assert download["duplicate"] and download["filename"] == "other.torrent"
+        mock_fetch.assert_not_called()
+
+        (tmp_path / "other.torrent").rename(tmp_path / "other.torrent.added")
+        download, _ = await grab()
+        assert download["filename"] == "other.torrent.added"
+
+        (tmp_path / "other.torrent.added").unlink()
+        download, mock_fetch = await grab()
+        assert "duplicate" not in download
+        mock_fetch.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_found_after_download_is_not_written(self, blackhole_client, tmp_path):
+        blackhole_client.watch_dir = tmp_path
+        blackhole_client.index = WatchDirIndex(tmp_path)
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=TORRENT_A))
+
+        with patch('src.app.blackhole.http_clients') as mock_clients:
+            mock_clients.get.return_value = httpx.AsyncClient(transport=transport)
+
+            first = await blackhole_client.download_torrent(
+                TorrentResult(title="Movie 2023", download_url="http://a.test/1"))
+            second = await blackhole_client.download_torrent(
+                TorrentResult(title="Movie (2023)", download_url="http://b.test/2"))
+
+        assert "duplicate" not in first
+        assert second["duplicate"] and second["filename"] == first["filename"]
+        assert [p.name for p in tmp_path.iterdir()] == [first["filename"]]
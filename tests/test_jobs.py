@@ -0,0 +1,167 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.app.jobs import AcquisitionTracker
+
+
+@pytest.fixture
+def tracker():
+    tracker = AcquisitionTracker()
+    tracker.interval = 0.01
+    tracker.max_interval = 0.04
+    return tracker
+
+
+@pytest.fixture
+def radarr():
+    radarr = MagicMock()
+    radarr.search_movie = AsyncMock(return_value=[{"title": "Alien", "year": 1979, "tmdbId": 348}])
+    radarr.pick_movie = MagicMock(side_effect=lambda results, year: results[0])
+    radarr.ensure_library = MagicMock()
+    radarr.monitor_movie = AsyncMock()
+    radarr.library.get = MagicMock(return_value=None)
+    radarr.add_movie = AsyncMock(return_value={"id": 7, "title": "Alien"})
+    radarr.search_existing = AsyncMock(return_value={"id": 55, "status": "queued"})
+    radarr.get_commands = AsyncMock(return_value=[{"id": 55, "status": "started"}])
+    radarr.get_queue = AsyncMock(return_value=[])
+    with patch('src.app.jobs.radarr_client', radarr):
+        yield radarr
+
+
+async def _settle(tracker):
+    await asyncio.gather(*tracker._tasks)
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_before_radarr_is_called(tracker, radarr):
+    job = tracker.submit("Alien", 1979)
+
+    assert job.status == "accepted"
+    assert tracker.get(job.id) is job
+    radarr.search_movie.assert_not_called()
+
+    await _settle(tracker)
+    await tracker.close()
+
+    assert job.status == "searching"
+    assert (job.movie_id, job.command_id, job.tmdb_id) == (7, 55, 348)
+    radarr.add_movie.assert_awaited_once_with(radarr.search_movie.return_value[0], search=False)
+    radarr.search_existing.assert_awaited_once_with(7)
+
+
+@pytest.mark.asyncio
+async def test_poll_marks_queued_movie_grabbed(tracker, radarr):
+    job = tracker.submit("Alien", 1979)
+    await _settle(tracker)
+
+    radarr.get_queue.return_value = [{"movieId": 7}]
+    await asyncio.wait_for(tracker._poll_task, 1)
+
+    assert job.status == "grabbed"
+    assert not tracker._active
+    # Every searching job shares one command list and one queue read per cycle
+    assert radarr.get_commands.await_count == radarr.get_queue.await_count
+
+
+@pytest.mark.asyncio
+async def test_completed_search_without_grab_settles_as_no_release(tracker, radarr):
+    job = tracker.submit("Alien", 1979)
+    await _settle(tracker)
+    await tracker.close()
+
+    radarr.get_commands.return_value = [{"id": 55, "status": "completed"}]
+    assert await tracker.poll_once() == 0
+    assert job.status == "searching"
+    assert await tracker.poll_once() == 1
+    assert job.status == "no_release"
+
+
+@pytest.mark.asyncio
+async def test_failed_search_command_is_reported(tracker, radarr):
+    job = tracker.submit("Alien", 1979)
+    await _settle(tracker)
+    await tracker.close()
+
+    radarr.get_commands.return_value = [{"id": 55, "status": "failed", "message": "Indexer unavailable"}]
+    assert await tracker.poll_once() == 1
+    assert job.status == "failed"
+    assert "Indexer unavailable" in job.message
+
+
+@pytest.mark.asyncio
+async def test_downloaded_movie_is_available_without_search(tracker, radarr):
+    radarr.library.get.return_value = {"id": 3, "title": "Alien", "hasFile": True}
+
+    job = tracker.submit("Alien", 1979)
+    await _settle(tracker)
+
+    assert job.status == "available"
+    radarr.add_movie.assert_not_called()
+    radarr.search_existing.assert_not_called()
+    assert tracker._poll_task is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_failures_end_the_job(tracker, radarr):
+    radarr.search_movie.return_value = []
+    missing = tracker.submit("Nothing")
+    await _settle(tracker)
+    assert missing.status == "not_found"
+
+    radarr.search_movie.side_effect = httpx.ConnectError("down")
+    broken = tracker.submit("Alien")
+    await _settle(tracker)
+    assert broken.status == "failed"
+
+    # Errors other than HTTP ones, e.g. an unexpected payload, fail the job too
+    radarr.search_movie.side_effect = None
+    radarr.search_movie.return_value = [{"title": "Alien", "tmdbId": 348}]
+    radarr.search_existing.side_effect = ValueError("Expecting value")
+    malformed = tracker.submit("Alien")
+    await _settle(tracker)
+    assert malformed.status == "failed"
+    assert "Expecting value" in malformed.message
+
+
+@pytest.mark.asyncio
+async def test_poll_backs_off_while_radarr_errors(tracker, radarr):
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(delay):
+        sleeps.append(delay)
+        if len(sleeps) == 4:
+            radarr.get_commands.side_effect = None
+            radarr.get_commands.return_value = [{"id": 55, "status": "started"}]
+            radarr.get_queue.return_value = [{"movieId": 7}]
+        await real_sleep(0)
+
+    job = tracker.submit("Alien", 1979)
+    await _settle(tracker)
+    await tracker.close()
+
+    radarr.get_commands.side_effect = [httpx.ConnectError("down"), TypeError("bad payload"),
+                                       httpx.ConnectError("down")]
+    tracker._active[job.id] = 0.0
+    tracker.timeout = float("inf")
+    with patch('src.app.jobs.asyncio.sleep', record_sleep):
+        await tracker._poll_loop()
+
+    assert sleeps == [0.01, 0.02, 0.04, 0.04]
+    assert job.status == "grabbed"
+
+
+def test_prune_keeps_active_jobs():
+    tracker = AcquisitionTracker()
+    tracker.history_size = 2
+    with patch.object(tracker, '_start', MagicMock()), patch('src.app.jobs.asyncio.create_task', MagicMock()):
+        first = tracker.submit("One")
+        second = tracker.submit("Two")
+        second.status = "grabbed"
+        tracker.submit("Three")
+
+    assert tracker.get(first.id) is first
+    assert tracker.get(second.id) is None
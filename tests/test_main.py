@@ -1,11 +1,12 @@
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.app.config import settings
 from src.app.main import app
+from src.app.models import AcquisitionJob
 
 
 @pytest.fixture
@@ -127,3 +128,68 @@ def test_grab_endpoint_blackhole_mode_no_results(client, auth_headers):
         assert data["status"] == "error"
         assert "No suitable torrents found" in data["message"]
 
+
+def test_bulk_grab_endpoint(client, auth_headers):
+    results = [
+        {"title": "Alien", "year": 1979, "status": "added", "tmdb_id": 348, "movie_id": 1},
+        {"title": "Nothing", "year": None, "status": "not_found", "message": "No movies found"},
+    ]
+
+    with patch('src.app.main.settings.mode', 'radarr'), \
+         patch('src.app.main.radarr_client.bulk_grab', new_callable=AsyncMock) as mock_bulk:
+        mock_bulk.return_value = results
+
+        response = client.post(
+            "/grab/bulk",
+            json={"items": [{"title": "Alien", "year": 1979}, {"title": "Nothing"}]},
+            headers=auth_headers
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert data["added"] == 1
+    assert [r["status"] for r in data["results"]] == ["added", "not_found"]
+    mock_bulk.assert_called_once_with([("Alien", 1979), ("Nothing", None)])
+
+
+@patch('src.app.main.settings.mode', 'blackhole')
+def test_bulk_grab_requires_radarr_mode(client, auth_headers):
+    response = client.post("/grab/bulk", json={"items": [{"title": "Alien"}]}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_acquisition_endpoints(client, auth_headers):
+    job = AcquisitionJob(
+        id="job-1", title="Alien", year=1979,
+        created_at="2024-01-01T00:00:00", updated_at="2024-01-01T00:00:00"
+    )
+
+    with patch('src.app.main.settings.mode', 'radarr'), \
+         patch('src.app.main.acquisition_tracker.submit', MagicMock(return_value=job)) as mock_submit, \
+         patch('src.app.main.acquisition_tracker.get', MagicMock(side_effect=[job, None])):
+        response = client.post("/acquisitions", json={"title": "Alien", "year": 1979}, headers=auth_headers)
+        assert response.status_code == 202
+        assert response.json()["job"]["id"] == "job-1"
+        assert response.json()["job"]["status"] == "accepted"
+        mock_submit.assert_called_once_with("Alien", 1979)
+
+        assert client.get("/acquisitions/job-1", headers=auth_headers).json()["title"] == "Alien"
+        assert client.get("/acquisitions/missing", headers=auth_headers).status_code == 404
+
+
+def test_radarr_webhook_requires_basic_auth(client):
+    payload = {"eventType": "Grab", "movie": {"id": 1, "title": "Alien", "tmdbId": 348}}
+
+    assert client.post("/webhooks/radarr", json=payload).status_code == 401
+    assert client.post("/webhooks/radarr", json=payload, auth=("radarr", "wrong")).status_code == 401
+
+    with patch('src.app.main.watchlist_manager.apply_radarr_event', new_callable=AsyncMock) as mock_apply, \
+         patch('src.app.main.radarr_client.apply_webhook') as mock_library:
+        mock_apply.return_value = 1
+        response = client.post("/webhooks/radarr", json=payload, auth=("radarr", settings.app_token))
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "event": "Grab", "updated": 1}
+    assert mock_apply.call_args.args[0].movie.tmdb_id == 348
+    mock_library.assert_called_once_with("Grab", 348, None)
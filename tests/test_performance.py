@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.app.performance import AsyncCache, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    cache = AsyncCache(default_ttl=60.0, max_size=2)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    assert await cache.get("a") == 1  # "b" is now least recently used
+    await cache.set("c", 3)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_caches_loaded_value():
+    cache = AsyncCache(default_ttl=60.0)
+    loader = AsyncMock(return_value="value")
+
+    assert await cache.get_or_load("key", loader) == "value"
+    assert await cache.get_or_load("key", loader) == "value"
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_serves_stale_and_refreshes_in_background():
+    cache = AsyncCache(default_ttl=60.0, stale_ttl=60.0)
+    await cache.set("key", "old")
+
+    refreshed = asyncio.Event()
+
+    async def loader():
+        refreshed.set()
+        return "new"
+
+    # Jump past expiry but inside the stale window
+    with patch('src.app.performance.time.time', return_value=cache._cache["key"]["expires"] + 1):
+        assert await cache.get_or_load("key", loader) == "old"
+        await asyncio.wait_for(refreshed.wait(), 1)
+        await asyncio.sleep(0)
+
+    assert await cache.get("key") == "new"
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_reloads_past_stale_window():
+    cache = AsyncCache(default_ttl=60.0, stale_ttl=10.0)
+    await cache.set("key", "old")
+    loader = AsyncMock(return_value="new")
+
+    with patch('src.app.performance.time.time', return_value=cache._cache["key"]["expires"] + 11):
+        assert await cache.get_or_load("key", loader) == "new"
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_value():
+    cache = AsyncCache(default_ttl=60.0, stale_ttl=60.0)
+    await cache.set("key", "old")
+    loader = AsyncMock(side_effect=RuntimeError("upstream down"))
+
+    with patch('src.app.performance.time.time', return_value=cache._cache["key"]["expires"] + 1):
+        assert await cache.get_or_load("key", loader) == "old"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert cache._cache["key"]["value"] == "old"
+        assert not cache._refreshing
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return ["result"]
+
+    waiters = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(result == ["result"] for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_errors_and_survives_cancellation():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await second
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_again_after_completion():
+    flight = SingleFlight()
+    work = AsyncMock(return_value=1)
+
+    await flight.do("key", work)
+    await flight.do("key", work)
+
+    assert work.await_count == 2
@@ -1,5 +1,9 @@
-from unittest.mock import patch
+import asyncio
+import contextlib
+import json
+from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
 from src.app.radarr import RadarrClient
@@ -7,7 +11,21 @@ from src.app.radarr import RadarrClient
 
 @pytest.fixture
 def radarr_client():
-    return RadarrClient()
+    client = RadarrClient()
+    client.base_url = "http://radarr.test"
+    client.api_key = "test-radarr-key"
+    client.headers = {"X-Api-Key": client.api_key, "Content-Type": "application/json"}
+    client.library.load([])  # Empty, freshly synced library
+    return client
+
+
+@contextlib.asynccontextmanager
+async def mock_radarr_http(handler):
+    """Serve Radarr requests from a MockTransport handler"""
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with patch('src.app.radarr.http_clients') as mock_clients:
+            mock_clients.get.return_value = client
+            yield
 
 
 @pytest.mark.asyncio
@@ -93,3 +111,247 @@ async def test_config_validation(radarr_client):
     assert radarr_client.api_key is not None
     assert "X-Api-Key" in radarr_client.headers
     assert radarr_client.headers["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_search_movie_coalesces_identical_lookups(radarr_client):
+    """Concurrent identical lookups reach Radarr once"""
+    release = asyncio.Event()
+    results = [{"title": "Inception", "year": 2010, "tmdbId": 27205}]
+
+    async def slow_lookup(term):
+        await release.wait()
+        return results
+
+    with patch.object(radarr_client, '_lookup', side_effect=slow_lookup) as mock_lookup:
+        waiters = [
+            asyncio.create_task(radarr_client.search_movie("Inception", 2010)),
+            asyncio.create_task(radarr_client.search_movie("inception ", 2010)),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [results, results]
+        mock_lookup.assert_called_once_with("Inception 2010")
+
+
+@pytest.mark.asyncio
+async def test_grab_skips_add_for_downloaded_movie(radarr_client):
+    """A movie already in the library with a file needs neither an add nor a search"""
+    radarr_client.library.load([
+        {"id": 7, "title": "Inception", "year": 2010, "tmdbId": 27205, "hasFile": True}
+    ])
+    lookup = [{"title": "Inception", "year": 2010, "tmdbId": 27205, "imdbId": "tt1375666"}]
+
+    with patch.object(radarr_client, 'search_movie', return_value=lookup), \
+         patch.object(radarr_client, 'add_movie', AsyncMock()) as mock_add, \
+         patch.object(radarr_client, 'search_existing', AsyncMock()) as mock_search:
+
+        result = await radarr_client.grab_movie("Inception", 2010)
+
+    assert result["already_in_library"] is True
+    assert result["search_triggered"] is False
+    mock_add.assert_not_called()
+    mock_search.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_grab_searches_existing_movie_without_file(radarr_client):
+    radarr_client.library.load([
+        {"id": 7, "title": "Inception", "year": 2010, "imdbId": "tt1375666", "hasFile": False}
+    ])
+    lookup = [{"title": "Inception", "year": 2010, "tmdbId": 27205, "imdbId": "tt1375666"}]
+
+    with patch.object(radarr_client, 'search_movie', return_value=lookup), \
+         patch.object(radarr_client, 'add_movie', AsyncMock()) as mock_add, \
+         patch.object(radarr_client, 'search_existing', AsyncMock()) as mock_search:
+
+        result = await radarr_client.grab_movie("Inception", 2010)
+
+    assert result["search_triggered"] is True
+    mock_add.assert_not_called()
+    mock_search.assert_called_once_with(7)
+
+
+@pytest.mark.asyncio
+async def test_grab_monitors_unmonitored_movie_before_searching(radarr_client):
+    movie = {"id": 7, "title": "Inception", "tmdbId": 27205, "hasFile": False, "monitored": False}
+    radarr_client.library.load([movie])
+    lookup = [{"title": "Inception", "year": 2010, "tmdbId": 27205}]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(202, json=[movie])
+
+    async with mock_radarr_http(handler):
+        with patch.object(radarr_client, 'search_movie', return_value=lookup), \
+             patch.object(radarr_client, 'search_existing', AsyncMock()) as mock_search:
+            await radarr_client.grab_movie("Inception", 2010)
+
+    assert requests[0].method == "PUT" and requests[0].url.path == "/api/v3/movie/editor"
+    assert json.loads(requests[0].content) == {"movieIds": [7], "monitored": True}
+    assert movie["monitored"] is True
+    mock_search.assert_called_once_with(7)
+
+
+@pytest.mark.asyncio
+async def test_stale_library_resyncs_in_background(radarr_client):
+    """A grab uses the current index instead of waiting for the library fetch"""
+    radarr_client.library.synced_at = None
+    release = asyncio.Event()
+    movies = [{"id": 7, "title": "Inception", "tmdbId": 27205, "hasFile": True}]
+
+    async def slow_sync():
+        await release.wait()
+        radarr_client.library.load(movies)
+        return 1
+
+    lookup = [{"title": "Inception", "year": 2010, "tmdbId": 27205}]
+    with patch.object(radarr_client, 'sync_library', side_effect=slow_sync) as mock_sync, \
+         patch.object(radarr_client, 'search_movie', return_value=lookup), \
+         patch.object(radarr_client, 'add_movie', AsyncMock(return_value={"id": 8})) as mock_add:
+        first = await asyncio.wait_for(radarr_client.grab_movie("Inception", 2010), 1)
+        await radarr_client.grab_movie("Inception", 2010)
+        assert mock_sync.call_count == 1  # One resync at a time
+
+        release.set()
+        await radarr_client._library_task
+        third = await radarr_client.grab_movie("Inception", 2010)
+
+    assert first["already_in_library"] is False
+    assert third["already_in_library"] is True
+    assert mock_add.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_library_and_added_movies_are_indexed(radarr_client):
+    movies = [{"id": 1, "title": "Alien", "tmdbId": 348, "imdbId": "tt0078748"}]
+    async with mock_radarr_http(lambda request: httpx.Response(200, json=movies)):
+        assert await radarr_client.sync_library() == 1
+
+    assert radarr_client.library.get(imdb_id="tt0078748")["id"] == 1
+    assert not radarr_client.library.is_stale(60.0)
+
+    added = {"id": 2, "title": "Aliens", "tmdbId": 679, "imdbId": "tt0090605"}
+    async with mock_radarr_http(lambda request: httpx.Response(201, json=added)):
+        await radarr_client.add_movie({"title": "Aliens", "tmdbId": 679})
+
+    assert radarr_client.library.get(tmdb_id=679)["id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_movie_is_added_again(radarr_client):
+    """A MovieDelete webhook drops the movie from the index instead of waiting for a resync"""
+    radarr_client.library.load([
+        {"id": 7, "title": "Inception", "tmdbId": 27205, "imdbId": "tt1375666", "hasFile": True}
+    ])
+    lookup = [{"title": "Inception", "year": 2010, "tmdbId": 27205, "imdbId": "tt1375666"}]
+
+    radarr_client.apply_webhook("MovieDelete", 27205)
+    assert radarr_client.library.get(imdb_id="tt1375666") is None
+
+    with patch.object(radarr_client, 'search_movie', return_value=lookup), \
+         patch.object(radarr_client, 'add_movie', AsyncMock(return_value={"id": 9})) as mock_add:
+        result = await radarr_client.grab_movie("Inception", 2010)
+
+    assert result["already_in_library"] is False
+    mock_add.assert_called_once()
+
+
+def test_file_events_update_has_file(radarr_client):
+    movie = {"id": 7, "title": "Inception", "tmdbId": 27205, "hasFile": True}
+    radarr_client.library.load([movie])
+
+    radarr_client.apply_webhook("MovieFileDelete", 27205)
+    assert movie["hasFile"] is False
+    radarr_client.apply_webhook("Download", 27205)
+    assert movie["hasFile"] is True
+    radarr_client.apply_webhook("Grab", 27205)
+    assert radarr_client.library.get(27205) is movie
+
+
+@pytest.mark.asyncio
+async def test_search_movie_is_cached_per_normalized_term(radarr_client):
+    results = [{"title": "Inception", "year": 2010, "tmdbId": 27205}]
+
+    with patch.object(radarr_client, '_lookup', AsyncMock(return_value=results)) as mock_lookup:
+        assert await radarr_client.search_movie("Inception", 2010) == results
+        assert await radarr_client.search_movie("  inception", 2010) == results
+
+    mock_lookup.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("term, path, params", [
+    ("tt1375666", "/api/v3/movie/lookup/imdb", {"imdbId": "tt1375666"}),
+    ("tmdb:27205", "/api/v3/movie/lookup/tmdb", {"tmdbId": "27205"}),
+])
+async def test_search_movie_resolves_ids_directly(radarr_client, term, path, params):
+    requests = []
+    movie = {"title": "Inception", "year": 2010, "tmdbId": 27205, "imdbId": "tt1375666"}
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=movie)
+
+    async with mock_radarr_http(handler):
+        assert await radarr_client.search_movie(term) == [movie]
+
+    assert requests[0].url.path == path
+    assert dict(requests[0].url.params) == params
+
+
+@pytest.mark.asyncio
+async def test_unknown_id_lookup_is_empty_and_not_cached(radarr_client):
+    async with mock_radarr_http(lambda request: httpx.Response(404)):
+        assert await radarr_client.search_movie("title", imdb_id="tt0000001") == []
+
+    assert len(radarr_client.lookup_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_grab_imports_new_movies_in_one_request(radarr_client):
+    radarr_client.library.load([{"id": 1, "title": "Alien", "tmdbId": 348}])
+    lookups = {
+        "Alien": [{"title": "Alien", "year": 1979, "tmdbId": 348}],
+        "Aliens": [{"title": "Aliens", "year": 1986, "tmdbId": 679}],
+        "Nothing": [],
+    }
+
+    async def fake_search(title, year=None):
+        if title == "Broken":
+            raise httpx.ConnectError("lookup failed")
+        return lookups[title]
+
+    imported = [{"id": 2, "title": "Aliens", "tmdbId": 679}]
+
+    with patch.object(radarr_client, 'search_movie', side_effect=fake_search), \
+         patch.object(radarr_client, 'import_movies', AsyncMock(return_value=imported)) as mock_import:
+
+        results = await radarr_client.bulk_grab(
+            [("Alien", 1979), ("Aliens", 1986), ("Nothing", None), ("Broken", None), ("Aliens", None)]
+        )
+
+    assert [r["status"] for r in results] == ["exists", "added", "not_found", "error", "added"]
+    assert results[0]["movie_id"] == 1
+    assert results[1]["movie_id"] == results[4]["movie_id"] == 2
+    mock_import.assert_called_once()
+    assert [m["tmdbId"] for m in mock_import.call_args.args[0]] == [679]
+
+
+@pytest.mark.asyncio
+async def test_import_movies_posts_bulk_payload(radarr_client):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=[{"id": 5, "title": "Aliens", "tmdbId": 679}])
+
+    async with mock_radarr_http(handler):
+        await radarr_client.import_movies([{"title": "Aliens", "tmdbId": 679}])
+
+    assert requests[0].url.path == "/api/v3/movie/import"
+    body = json.loads(requests[0].content)
+    assert body[0]["tmdbId"] == 679 and body[0]["addOptions"]["searchForMovie"] is True
+    assert radarr_client.library.get(tmdb_id=679)["id"] == 5
@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.app.models import RadarrWebhook, WatchlistRequest
+from src.app.watchlist import WatchlistManager
+
+
+def _event(event_type, tmdb_id=348, **extra):
+    return RadarrWebhook.model_validate({
+        "eventType": event_type,
+        "movie": {"id": 1, "title": "Alien", "year": 1979, "tmdbId": tmdb_id},
+        **extra
+    })
+
+
+@pytest.fixture
+def manager():
+    grab = AsyncMock(return_value={
+        "movie": {"title": "Alien", "year": 1979, "tmdbId": 348},
+        "radarr_result": {"id": 1, "hasFile": False},
+        "search_triggered": True,
+        "already_in_library": False
+    })
+    with patch('src.app.watchlist.settings.mode', 'radarr'), \
+         patch('src.app.watchlist.radarr_client.grab_movie', grab):
+        yield WatchlistManager()
+
+
+@pytest.mark.asyncio
+async def test_radarr_add_waits_for_webhook(manager):
+    watchlist_id, success = await manager.add_to_watchlist(WatchlistRequest(title="Alien", year=1979))
+
+    item = await manager.get_watchlist_item(watchlist_id)
+    assert success
+    assert item.status == "pending"
+    assert item.tmdb_id == 348
+
+
+@pytest.mark.asyncio
+async def test_webhook_events_drive_status(manager):
+    watchlist_id, _ = await manager.add_to_watchlist(WatchlistRequest(title="Alien", year=1979))
+    item = await manager.get_watchlist_item(watchlist_id)
+
+    assert await manager.apply_radarr_event(_event("Grab")) == 1
+    assert item.status == "downloading"
+
+    assert await manager.apply_radarr_event(_event("Download")) == 1
+    assert item.status == "available"
+
+    # An upgrade grab does not hide the file that is already there
+    assert await manager.apply_radarr_event(_event("Grab", isUpgrade=True)) == 0
+    assert item.status == "available"
+
+    assert await manager.apply_radarr_event(_event("MovieFileDelete")) == 1
+    assert item.status == "pending"
+
+    await manager.mark_as_watched(watchlist_id)
+    assert await manager.apply_radarr_event(_event("Download")) == 0
+    assert item.status == "watched"
+
+
+@pytest.mark.asyncio
+async def test_webhook_ignores_unknown_movies_and_events(manager):
+    watchlist_id, _ = await manager.add_to_watchlist(WatchlistRequest(title="Alien", year=1979))
+
+    assert await manager.apply_radarr_event(_event("Grab", tmdb_id=679)) == 0
+    assert await manager.apply_radarr_event(_event("Test")) == 0
+    assert await manager.apply_radarr_event(RadarrWebhook.model_validate({"eventType": "Health"})) == 0
+    assert (await manager.get_watchlist_item(watchlist_id)).status == "pending"
+
+
+@pytest.mark.asyncio
+async def test_removed_items_leave_the_index(manager):
+    watchlist_id, _ = await manager.add_to_watchlist(WatchlistRequest(title="Alien", year=1979))
+    await manager.remove_from_watchlist(watchlist_id)
+
+    assert await manager.apply_radarr_event(_event("Download")) == 0
+    assert manager._by_tmdb == {}